@@ -1,70 +1,65 @@
-import importlib
 import argparse
 import textwrap
+from functools import lru_cache
+
+
+_EPILOG = textwrap.dedent(
+    """
+Pattern Syntax:
+  literals      Match exact characters
+  (group)       Capture group with alternation support
+  a|b           Alternation (match a or b)
+  +             One or more of previous token
+  ?             Zero or one of previous token
+  [abc]         Character class
+  [^abc]        Negated character class
+  ^             Start of line anchor
+  $             End of line anchor
+  \\1, \\2        Backreferences to captured groups
+  \\d, \\w        Digit and word character classes
+  .             Any character wildcard
+
+Examples:
+  ./pygrep.sh -E "error" log.txt
+  ./pygrep.sh -r -E "^import" src/
+  ./pygrep.sh -n -E "\\d+" data.txt
+"""
+)
 
 
 def get_version() -> str:
     """
     Return the current version of the package as a string.
 
-    Attempts to import the 'src' module and read its __version__ attribute.
-    If the module or attribute is unavailable, returns 'unknown' to avoid
-    breaking the program.
+    Reads `__version__` from the package this module belongs to, which is
+    already imported, so no module lookup through importlib is needed. If
+    the attribute is unavailable, returns 'unknown' to avoid breaking the
+    program.
     """
     try:
-        version_str = importlib.import_module("src").__version__
-    except (ModuleNotFoundError, AttributeError):
+        # pylint: disable-next=import-outside-toplevel
+        from . import __version__ as version_str
+    except ImportError:
         version_str = "unknown"
     return version_str
 
 
-def parse_arguments() -> argparse.Namespace:
+@lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
     """
-    Parse and return command-line arguments for the pygrep tool.
+    Build the argument parser for the pygrep tool.
 
-    Uses argparse to define available options and positional arguments,
-    including pattern, files, and flags for extended regex, recursion, line
-    numbers, case sensitivity, inverted matches, and count mode. Validates
-    that at least one pattern is specified and at least one file is provided
-    for recursive searches.
+    Cached, so the parser and its options are only set up on the first
+    call; later calls to `parse_arguments()` reuse it.
 
     Returns:
-        argparse.Namespace: Parsed command-line arguments as attributes.
-
-    Example:
-        $ ./pygrep.sh -r -n -i "\\d+" data.txt
-        args.pattern       -> "\\d+"
-        args.files         -> ["data.txt"]
-        args.recursive     -> True
-        args.line_number   -> True
-        args.ignore_case   -> True
+        argparse.ArgumentParser: The configured parser.
     """
     parser = argparse.ArgumentParser(
         prog="pygrep",
         description="Search for patterns in files using custom regex engine",
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=textwrap.dedent(
-            """
-        Pattern Syntax:
-          literals      Match exact characters
-          (group)       Capture group with alternation support
-          a|b           Alternation (match a or b)
-          +             One or more of previous token
-          ?             Zero or one of previous token
-          [abc]         Character class
-          [^abc]        Negated character class
-          ^             Start of line anchor
-          $             End of line anchor
-          \\1, \\2        Backreferences to captured groups
-          \\d, \\w        Digit and word character classes
-          .             Any character wildcard
-        
-        Examples:
-          ./pygrep.sh -E "error" log.txt
-          ./pygrep.sh -r -E "^import" src/
-          ./pygrep.sh -n -E "\\d+" data.txt
-        """
-        ),
+        epilog=_EPILOG,
     )
 
     parser.add_argument(
@@ -102,6 +97,18 @@ def parse_arguments() -> argparse.Namespace:
         help="Recursively search all files under each directory",
     )
 
+    parser.add_argument(
+        "--exclude-dir",
+        action="append",
+        dest="exclude_dirs",
+        default=[],
+        metavar="GLOB",
+        help=(
+            "Skip directories whose name matches GLOB when searching "
+            "recursively (can be used multiple times)"
+        ),
+    )
+
     parser.add_argument(
         "-n",
         "--line-number",
@@ -213,6 +220,44 @@ def parse_arguments() -> argparse.Namespace:
         "--json", action="store_true", help="Output results as JSON format"
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="NUM",
+        default=1,
+        help=(
+            "Search files or stdin lines in NUM worker processes "
+            "(0 uses one per CPU)"
+        ),
+    )
+
+    return parser
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse and return command-line arguments for the pygrep tool.
+
+    Uses the argparse parser from `_build_parser()`, which defines the
+    available options and positional arguments, including pattern, files,
+    and flags for extended regex, recursion, line numbers, case sensitivity,
+    inverted matches, and count mode. Validates
+    that at least one pattern is specified and at least one file is provided
+    for recursive searches.
+
+    Returns:
+        argparse.Namespace: Parsed command-line arguments as attributes.
+
+    Example:
+        $ ./pygrep.sh -r -n -i "\\d+" data.txt
+        args.pattern       -> "\\d+"
+        args.files         -> ["data.txt"]
+        args.recursive     -> True
+        args.line_number   -> True
+        args.ignore_case   -> True
+    """
+    parser = _build_parser()
     args = parser.parse_args()
 
     if (args.patterns or args.pattern_file) and args.pattern and not args.files:
@@ -240,11 +285,11 @@ def parse_arguments() -> argparse.Namespace:
 
     if args.pattern_file:
         try:
+            # Read in one call; text mode has already turned \r\n and \r
+            # into \n, so splitting on \n gives the same lines as iterating.
             with open(args.pattern_file, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        all_patterns.append(line)
+                lines = f.read().split("\n")
+            all_patterns.extend(filter(None, map(str.strip, lines)))
         except FileNotFoundError:
             parser.error(f"pattern file not found: {args.pattern_file}")
         except IsADirectoryError:
@@ -260,6 +305,9 @@ def parse_arguments() -> argparse.Namespace:
     if args.recursive and not args.files:
         parser.error("at least one FILE required for recursive search")
 
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 or a positive number")
+
     if args.context > 0:
         args.before_context = args.context
         args.after_context = args.context
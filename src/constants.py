@@ -19,6 +19,48 @@ TOKEN_BACKREFERENCE = "backreference"
 QUANTIFIER_ONE_OR_MORE = "+"
 QUANTIFIER_ZERO_OR_ONE = "?"
 
+# Program opcodes produced by the pattern compiler
+OP_CHAR = 0
+OP_PLUS = 1
+OP_OPT = 2
+OP_SPLIT = 3
+OP_JMP = 4
+OP_GROUP_START = 5
+OP_GROUP_END = 6
+OP_REPEAT = 7
+OP_BACKREF = 8
+OP_MATCH = 9
+OP_BOUNDED = 10
+
+# Largest visited bitmap (instructions x line positions) the backtracker may
+# allocate; longer lines are matched with the NFA simulation instead
+MAX_VISITED_STATES = 1 << 16
+
+# Most DFA states the lazy DFA of one pattern may build; lines that need more
+# fall back to the NFA simulation
+MAX_DFA_STATES = 1024
+
+# Bytes read from the start of each file found by a recursive search to
+# detect binary files, which are skipped
+BINARY_CHECK_BYTES = 8192
+
+# Characters read from a file at a time when searching it; lines are split
+# out of each block
+READ_BLOCK_CHARS = 1 << 20
+
+# A block is only searched for the patterns' literal prefixes when they occur
+# on at most one line in this many; denser blocks are matched line by line
+SPARSE_LITERAL_RATIO = 8
+
+# Parallel stdin matching (--jobs): lines read per batch, and the smallest
+# batch worth sending to worker processes
+PARALLEL_BATCH_LINES = 8192
+PARALLEL_MIN_LINES = 2048
+
+# Parallel file searches (--jobs): files handed to worker processes ahead of
+# the one whose result is next, per worker
+PARALLEL_FILES_PER_JOB = 4
+
 # Error messages
 ERROR_USAGE = "Usage: pygrep [-r] -E PATTERN [FILE...]"
 ERROR_EXPECTED_E_AFTER_R = "Expected '-E' after '-r'"
@@ -1,42 +1,309 @@
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+import mmap
 import os
+import stat
 import sys
 from collections import deque
-from .pattern_matcher import match_pattern
+from fnmatch import fnmatchcase
+from itertools import islice
+from .pattern_matcher import CompiledPattern, compile_patterns, match_any
 from .output_formatters import MatchResult
+from .parallel_search import iter_file_results
+from .constants import BINARY_CHECK_BYTES, READ_BLOCK_CHARS, SPARSE_LITERAL_RATIO
 
 
-def _format_line_output(
-    line_text: str,
-    line_number: int,
-    filename: Optional[str] = None,
-    show_filename: bool = False,
-    show_line_number: bool = False,
-) -> str:
+def _line_formatter(
+    filename: Optional[str], show_filename: bool, show_line_number: bool
+) -> Callable[[int, str], str]:
     """
-    Helper function to format the output line with optional prefixes.
+    Picks the output format for matched and context lines once per file.
+
+    The filename prefix is built here, and the returned function only
+    formats the parts that change from line to line, so the flags are not
+    checked again for every line printed.
 
     Args:
-        line_text (str): The content of the line.
-        line_number (int): The line number in the file.
-        filename (str, optional): The name of the file. Defaults to None.
-        show_filename (bool, optional):
-            Whether to include filename in output.
-            Default is False.
-        show_line_number (bool, optional):
-            Whether to include the line number in output.
-            Default is False.
+        filename (str, optional): The name of the file being searched.
+        show_filename (bool): Whether to include the filename in output.
+        show_line_number (bool): Whether to include the line number in
+            output.
 
     Returns:
-        str: Formatted output line, like "file.txt:42:content" or just "content".
+        Callable[[int, str], str]: Takes a line number and the line's
+        content, and returns the output line with its newline, like
+        "file.txt:42:content\n" or just "content\n".
     """
-    output = ""
-    if show_filename and filename is not None:
-        output += f"{filename}:"
+    prefix = f"{filename}:" if show_filename and filename is not None else ""
+
     if show_line_number:
-        output += f"{line_number}:"
-    output += line_text
-    return output
+
+        def format_line(line_number: int, line_text: str) -> str:
+            return f"{prefix}{line_number}:{line_text}\n"
+
+    else:
+
+        def format_line(_line_number: int, line_text: str) -> str:
+            return f"{prefix}{line_text}\n"
+
+    return format_line
+
+
+def _file_may_match(
+    filename: str, compiled_patterns: list[CompiledPattern], ignore_case: bool
+) -> bool:
+    """
+    Checks the raw bytes of a file for text every match would need.
+
+    Every match of a pattern contains its `required` literal, so if none
+    of the patterns' literals occur anywhere in the file, no line can
+    match. The file is searched with `_find_in_file()`, which skips
+    reading it line by line and decoding it as UTF-8.
+
+    Args:
+        filename (str): Path to the file being searched.
+        compiled_patterns (list[CompiledPattern]): Patterns to check; a line
+            matches if any does.
+        ignore_case (bool): If True, ignores case. The raw bytes cannot be
+            searched case-insensitively, so the file is never ruled out.
+
+    Returns:
+        bool: False if no line of the file can match, True if it has to be
+        searched.
+    """
+    if ignore_case:
+        return True
+
+    literals = []
+    for compiled in compiled_patterns:
+        required = compiled.required
+        if not required:
+            return True
+        literals.append(required.encode("utf-8"))
+
+    return _find_in_file(filename, literals) is not False
+
+
+def _file_must_match(
+    filename: str, compiled_patterns: list[CompiledPattern], ignore_case: bool
+) -> bool:
+    """
+    Checks the raw bytes of a file for text that is a match on its own.
+
+    A pattern without anchors or backreferences whose literal prefix is as
+    long as its shortest match, such as `error` or `err(or)?`, matches
+    every line that contains the prefix. If one of those prefixes occurs
+    in the file, some line matches, which is all `-l` and `-L` need to
+    know, so the file does not have to be decoded and read line by line.
+
+    Args:
+        filename (str): Path to the file being searched.
+        compiled_patterns (list[CompiledPattern]): Patterns to check; a line
+            matches if any does.
+        ignore_case (bool): If True, ignores case, and the file is never
+            known to match from its raw bytes.
+
+    Returns:
+        bool: True if a line of the file is known to match, False if the
+        file has to be searched to find out.
+    """
+    if ignore_case:
+        return False
+
+    literals = [
+        compiled.prefix.encode("utf-8")
+        for compiled in compiled_patterns
+        if compiled.prefix
+        and compiled.min_length == len(compiled.prefix)
+        and not (
+            compiled.has_start_anchor
+            or compiled.has_end_anchor
+            or compiled.uses_backrefs
+        )
+    ]
+    return bool(literals) and _find_in_file(filename, literals) is True
+
+
+def _find_in_file(filename: str, literals: list[bytes]) -> Optional[bool]:
+    """
+    Searches the raw bytes of a file for any of several byte strings.
+
+    The file is memory-mapped and searched with `mmap.find()`. The mapping
+    is advised with `MADV_SEQUENTIAL` where the platform has it, so the
+    kernel reads ahead of the scan.
+
+    Args:
+        filename (str): Path to the file.
+        literals (list[bytes]): The byte strings to look for.
+
+    Returns:
+        Optional[bool]: True if any of `literals` occurs in the file, False
+        if none does, or None if the file cannot be mapped.
+
+    Raises:
+        OSError: If the file cannot be opened.
+    """
+    with open(filename, "rb") as file:
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                # Each find() reads the mapping front to back; tell the
+                # kernel so it reads ahead aggressively. Windows lacks madvise.
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    data.madvise(mmap.MADV_SEQUENTIAL)
+                return any(data.find(literal) != -1 for literal in literals)
+        except ValueError:
+            # Empty files cannot be mapped, and neither can files such as
+            # those under /proc that report a size of 0; read them normally.
+            return None
+
+
+def _open_for_reading(filename: str) -> TextIO:
+    """
+    Opens a file as UTF-8 text for a front-to-back read.
+
+    Where the platform supports it, the kernel is told the file will be
+    read sequentially, which widens its readahead window so the next
+    blocks are already cached when `_iter_lines()` asks for them. The hint
+    is best effort: files that reject it, such as pipes, are read as
+    usual.
+
+    Args:
+        filename (str): Path to the file.
+
+    Returns:
+        TextIO: The open file, to be used as a context manager.
+
+    Raises:
+        OSError: If the file cannot be opened.
+    """
+    # pylint: disable-next=consider-using-with
+    file = open(filename, encoding="utf-8")
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return file
+
+
+def _iter_lines(
+    file: TextIO, literals: tuple[str, ...] = (), fold_case: bool = False
+) -> Iterator[tuple[int, str]]:
+    """
+    Yields the numbered lines of a text file, read in large blocks.
+
+    The file is read `READ_BLOCK_CHARS` characters at a time and each block
+    is split into lines here, which costs about the same as iterating over
+    the file but lets lines be skipped in bulk. When `literals` is given,
+    lines that contain none of them may be left out: in blocks where the
+    literals are sparse, `str.find()` jumps from one occurrence to the next
+    and the lines in between are only counted. Blocks where they occur on
+    more than one line in `SPARSE_LITERAL_RATIO` are yielded whole, since
+    jumping between that many occurrences costs more than matching every
+    line. Line numbers always count every line of the file.
+
+    With `fold_case`, the literals are looked for in a lowercased copy of
+    each block, and the lines are still yielded as they are in the file.
+
+    Args:
+        file (TextIO): File opened in text mode.
+        literals (tuple[str, ...], optional): Text of which every wanted
+            line contains at least one. Defaults to (), which yields every
+            line.
+        fold_case (bool, optional): If True, `literals` are lowercase and
+            match text in any case. Defaults to False.
+
+    Yields:
+        tuple[int, str]: The 1-based line number and the line without its
+        newline.
+    """
+    line_number = 0
+    # Pieces of the line still being read; joined once its newline arrives,
+    # so a very long line is not copied again for every block.
+    pending = []
+
+    while chunk := file.read(READ_BLOCK_CHARS):
+        end = chunk.rfind("\n") + 1
+        if not end:
+            pending.append(chunk)
+            continue
+        pending.append(chunk[:end])
+        block = "".join(pending)
+        pending = [chunk[end:]]
+
+        newlines = block.count("\n")
+        haystack = block
+        if fold_case and literals:
+            haystack = block.lower()
+            # lower() never shortens a character, so equal lengths mean each
+            # offset in the folded text is the same offset in the block.
+            if len(haystack) != len(block):
+                haystack = None
+        if (
+            not literals
+            or haystack is None
+            or sum(haystack.count(literal) for literal in literals)
+            * SPARSE_LITERAL_RATIO
+            > newlines
+        ):
+            lines = block.split("\n")
+            lines.pop()
+            yield from enumerate(lines, line_number + 1)
+            line_number += newlines
+            continue
+
+        start = 0
+        while True:
+            position = -1
+            for literal in literals:
+                found = haystack.find(literal, start)
+                if found != -1 and (position == -1 or found < position):
+                    position = found
+            if position == -1:
+                line_number += block.count("\n", start)
+                break
+            line_start = max(block.rfind("\n", start, position) + 1, start)
+            line_end = block.find("\n", position)
+            line_number += block.count("\n", start, line_start) + 1
+            yield line_number, block[line_start:line_end]
+            start = line_end + 1
+
+    last_line = "".join(pending)
+    if last_line:
+        yield line_number + 1, last_line
+
+
+def _count_matching_lines(
+    lines: Iterable[tuple[int, str]],
+    compiled_patterns: list[CompiledPattern],
+    ignore_case: bool,
+    invert_match: bool,
+    max_count: int,
+) -> int:
+    """
+    Counts selected lines for `-c` when no context lines are needed.
+
+    Nothing is printed or collected per line, so this loop only matches
+    and counts, leaving out the output and context bookkeeping of the
+    general loop in `search_file()`.
+
+    Args:
+        lines (Iterable[tuple[int, str]]): Numbered lines from `_iter_lines()`.
+        compiled_patterns (list[CompiledPattern]): Patterns to check; a line
+            matches if any does.
+        ignore_case (bool): If True, ignores case.
+        invert_match (bool): If True, counts lines that do not match.
+        max_count (int): Stops counting at this many lines. 0 means no limit.
+
+    Returns:
+        int: The number of selected lines, at most `max_count` if set.
+    """
+    count = 0
+    for _idx, line in lines:
+        if match_any(line, compiled_patterns, ignore_case) is not invert_match:
+            count += 1
+            if count == max_count:
+                break
+    return count
 
 
 def search_file(
@@ -59,8 +326,14 @@ def search_file(
     """
     Search a file for lines matching a pattern.
 
-    Opens and reads file one line at a time, calling `match_pattern()`
-    with optional flags for case-insensitive and inverted matching.
+    Compiles the patterns once with `compile_patterns()`, then reads the
+    file in large blocks with `_iter_lines()`, calling `match_any()` on each
+    line with optional flags for case-insensitive and inverted matching.
+    When every pattern has a required literal and no context or inverted
+    output is needed, lines without any of them are skipped inside
+    `_iter_lines()` instead of being matched, in any case with `-i`.
+    Files that cannot contain a match are ruled out first by
+    `_file_may_match()`, without decoding them.
     Then prints matched lines either with filename and line numbers (optional)
     or a total count of matches. Missing files, directories and permissions
     are handled to prevent interruption.
@@ -103,30 +376,54 @@ def search_file(
     if not patterns_to_check:
         return False
 
-    if not os.path.isfile(filename):
-        if os.path.isdir(filename):
+    # One stat call tells regular files, directories and missing paths
+    # apart, where os.path.isfile() and isdir() would each make their own.
+    try:
+        mode = os.stat(filename).st_mode
+    except (OSError, ValueError):
+        mode = 0
+    if not stat.S_ISREG(mode):
+        if stat.S_ISDIR(mode):
             print(f"{filename}: is a directory", file=sys.stderr)
         else:
             print(f"{filename}: no such file or directory", file=sys.stderr)
         return False
 
+    compiled_patterns = compile_patterns(patterns_to_check, ignore_case)
+
+    try:
+        may_match = invert_match or _file_may_match(
+            filename, compiled_patterns, ignore_case
+        )
+    except (PermissionError, OSError):
+        print(f"{filename}: permission denied", file=sys.stderr)
+        return False
+
+    # Lines without any pattern's required literal cannot match, so they
+    # can be skipped unread when only matching lines are needed.
+    literals = ()
+    if not (invert_match or before_context or after_context):
+        required = tuple(compiled.required for compiled in compiled_patterns)
+        if all(required):
+            literals = required
+
     if files_with_matches or files_without_match:
         match_found = False
 
         try:
-            with open(filename, encoding="utf-8") as file:
-                for line in file:
-                    line = line.rstrip("\n")
-                    matches = False
-                    for p in patterns_to_check:
-                        if match_pattern(line, p, ignore_case=ignore_case):
-                            matches = True
+            # Only whether some line matches is needed, which the raw bytes
+            # can settle for plain literal patterns.
+            if may_match and not invert_match:
+                match_found = _file_must_match(filename, compiled_patterns, ignore_case)
+            if may_match and not match_found:
+                with _open_for_reading(filename) as file:
+                    for _idx, line in _iter_lines(file, literals, ignore_case):
+                        matches = match_any(line, compiled_patterns, ignore_case)
+                        if invert_match:
+                            matches = not matches
+                        if matches:
+                            match_found = True
                             break
-                    if invert_match:
-                        matches = not matches
-                    if matches:
-                        match_found = True
-                        break
         except (PermissionError, OSError):
             print(f"{filename}: permission denied", file=sys.stderr)
             return False
@@ -150,26 +447,60 @@ def search_file(
             else:
                 return False
 
+    if count_only and not (before_context or after_context or quiet or collect_results):
+        try:
+            with _open_for_reading(filename) as file:
+                match_count = _count_matching_lines(
+                    _iter_lines(file, literals, ignore_case) if may_match else (),
+                    compiled_patterns,
+                    ignore_case,
+                    invert_match,
+                    max_count,
+                )
+        except (PermissionError, OSError):
+            print(f"{filename}: permission denied", file=sys.stderr)
+            return False
+        except UnicodeDecodeError:
+            print(
+                f"{filename}: could not decode file with UTF-8 encoding",
+                file=sys.stderr,
+            )
+            return False
+
+        if print_filename:
+            print(f"{filename}:{match_count}")
+        else:
+            print(match_count)
+        if max_count > 0:
+            return match_count >= max_count
+        return match_count > 0
+
+    # Matched and context lines go straight to the stream's write method,
+    # skipping print()'s argument handling for every line.
+    write = sys.stdout.write
+    format_line = _line_formatter(filename, print_filename, print_line_number)
     match_count = 0
     match_found = False
     after_context_counter = 0
-    printed_lines = set()
+    # Lines are printed in increasing order, so remembering the last one
+    # printed is enough to avoid printing a context line twice.
+    last_printed = 0
     matches_found = 0
 
+    # Every line is read when before_context is set (no literal skipping),
+    # so the buffer holds only the text of the lines just before the
+    # current one and their numbers follow from the current line's.
     if before_context > 0:
         before_context_buffer = deque(maxlen=before_context)
     else:
         before_context_buffer = None
 
     try:
-        with open(filename, encoding="utf-8") as file:
-            for idx, line in enumerate(file, start=1):
-                line = line.rstrip("\n")
-                matches = False
-                for p in patterns_to_check:
-                    if match_pattern(line, p, ignore_case=ignore_case):
-                        matches = True
-                        break
+        with _open_for_reading(filename) as file:
+            for idx, line in (
+                _iter_lines(file, literals, ignore_case) if may_match else ()
+            ):
+                matches = match_any(line, compiled_patterns, ignore_case)
 
                 if invert_match:
                     matches = not matches
@@ -193,36 +524,37 @@ def search_file(
                             )
                         )
                     else:
+                        # Leading context and the match line are joined
+                        # and written together.
+                        output = ""
                         if before_context_buffer:
-                            for buf_idx, buf_line in before_context_buffer:
-                                if buf_idx not in printed_lines:
-                                    print(
-                                        _format_line_output(
-                                            line_text=buf_line,
-                                            line_number=buf_idx,
-                                            filename=filename,
-                                            show_filename=print_filename,
-                                            show_line_number=print_line_number,
-                                        )
+                            buffered = len(before_context_buffer)
+                            unprinted = min(idx - 1 - last_printed, buffered)
+                            if unprinted > 0:
+                                output = "".join(
+                                    map(
+                                        format_line,
+                                        range(idx - unprinted, idx),
+                                        islice(
+                                            before_context_buffer,
+                                            buffered - unprinted,
+                                            None,
+                                        ),
                                     )
-                                    printed_lines.add(buf_idx)
+                                )
+                                last_printed = idx - 1
 
                         if count_only:
                             match_count += 1
                         else:
-                            if idx not in printed_lines:
-                                print(
-                                    _format_line_output(
-                                        line_text=line,
-                                        line_number=idx,
-                                        filename=filename,
-                                        show_filename=print_filename,
-                                        show_line_number=print_line_number,
-                                    )
-                                )
-                                printed_lines.add(idx)
+                            if idx > last_printed:
+                                output += format_line(idx, line)
+                                last_printed = idx
                             after_context_counter = after_context
 
+                        if output:
+                            write(output)
+
                         if 0 < max_count <= matches_found:
                             if count_only:
                                 if print_filename:
@@ -231,21 +563,13 @@ def search_file(
                                     print(match_count)
                             return True
                 elif after_context_counter > 0 and not collect_results:
-                    if idx not in printed_lines:
-                        print(
-                            _format_line_output(
-                                line_text=line,
-                                line_number=idx,
-                                filename=filename,
-                                show_filename=print_filename,
-                                show_line_number=print_line_number,
-                            )
-                        )
-                        printed_lines.add(idx)
+                    if idx > last_printed:
+                        write(format_line(idx, line))
+                        last_printed = idx
                     after_context_counter -= 1
 
                 if before_context_buffer is not None and not quiet:
-                    before_context_buffer.append((idx, line))
+                    before_context_buffer.append(line)
 
     except (PermissionError, OSError):
         print(f"{filename}: permission denied", file=sys.stderr)
@@ -284,13 +608,16 @@ def search_multiple_files(
     files_with_matches: bool = False,
     files_without_match: bool = False,
     collect_results: bool = False,
+    jobs: int = 1,
 ) -> bool | list[MatchResult]:
     """
     Searches through multiple files for lines matching a given pattern.
 
     Calls `search_file()` for the actual searching logic after iterating
     over all provided filenames. Collects results and returns True if any
-    file contains a line matching the pattern.
+    file contains a line matching the pattern. With more than one job, the
+    files are searched in worker processes through `iter_file_results()`,
+    and their output is printed in the order the files were given.
 
     Args:
         filenames (list[str]): Paths of files to search.
@@ -310,53 +637,40 @@ def search_multiple_files(
             matching lines.
         files_without_match (bool): If True, only print names of files without
             matching lines.
+        jobs (int): Number of worker processes to search files in. Defaults
+            to 1, which searches in this process.
 
     Returns:
         bool: True if at least one matching line is found, else False.
     """
+    search_args = {
+        "pattern": pattern,
+        "print_filename": not (files_with_matches or files_without_match),
+        "print_line_number": print_line_number,
+        "ignore_case": ignore_case,
+        "invert_match": invert_match,
+        "count_only": count_only,
+        "after_context": after_context,
+        "before_context": before_context,
+        "patterns": patterns,
+        "quiet": quiet,
+        "max_count": max_count,
+        "files_with_matches": files_with_matches,
+        "files_without_match": files_without_match,
+        "collect_results": collect_results,
+    }
+    file_results = iter_file_results(search_file, filenames, search_args, jobs)
+
     if collect_results:
         all_results = []
-        for filename in filenames:
-            file_results = search_file(
-                filename,
-                pattern,
-                print_filename=not (files_with_matches or files_without_match),
-                print_line_number=print_line_number,
-                ignore_case=ignore_case,
-                invert_match=invert_match,
-                count_only=count_only,
-                after_context=after_context,
-                before_context=before_context,
-                patterns=patterns,
-                quiet=quiet,
-                max_count=max_count,
-                files_with_matches=files_with_matches,
-                files_without_match=files_without_match,
-                collect_results=True,
-            )
-            if isinstance(file_results, list):
-                all_results.extend(file_results)
+        for results in file_results:
+            if isinstance(results, list):
+                all_results.extend(results)
         return all_results
 
     match_found = False
 
-    for filename in filenames:
-        file_with_match = search_file(
-            filename,
-            pattern,
-            print_filename=not (files_with_matches or files_without_match),
-            print_line_number=print_line_number,
-            ignore_case=ignore_case,
-            invert_match=invert_match,
-            count_only=count_only,
-            after_context=after_context,
-            before_context=before_context,
-            patterns=patterns,
-            quiet=quiet,
-            max_count=max_count,
-            files_with_matches=files_with_matches,
-            files_without_match=files_without_match,
-        )
+    for file_with_match in file_results:
         if file_with_match:
             match_found = True
             if quiet:
@@ -365,42 +679,116 @@ def search_multiple_files(
     return match_found
 
 
-def get_files_recursively(directory: str) -> list[str]:
+def get_files_recursively(
+    directory: str, exclude_dirs: Optional[list[str]] = None
+) -> list[str]:
     """
     Recursively collect all file paths under a given directory.
 
-    Uses the os module with `os.walk()` to scan the directory tree and
-    collects full file paths. Handles missing paths or permission errors.
+    Collects everything `iter_files_recursively()` yields into a list.
+    Handles missing paths or permission errors the same way.
 
     Args:
         directory (str): Path to the root directory to scan.
+        exclude_dirs (list[str], optional): Glob patterns for names of
+            subdirectories to skip. Defaults to None.
 
     Returns:
         list[str]: A list of absolute file paths found in the directory
         and subdirectories. Returns an empty list if no files are found
         or an error is encountered.
     """
-    if not os.path.exists(directory):
+    return list(iter_files_recursively(directory, exclude_dirs))
+
+
+def iter_files_recursively(
+    directory: str, exclude_dirs: Optional[list[str]] = None
+) -> Iterator[str]:
+    """
+    Yields the paths of all files under a given directory as they are found.
+
+    Walks the directory tree depth-first with `os.scandir()`, keeping a
+    stack of directories still to list instead of recursing. Each entry's
+    type comes from the directory listing itself, so no extra `stat()` call
+    is made per file. Files come out in the same order as with `os.walk()`,
+    and symlinked directories are not followed. Only regular files, or
+    links to them, are yielded, like GNU grep skipping devices found while
+    recursing. Binary files, detected by `_is_binary_file()`, are left out
+    so no matching is spent on them. Since paths are yielded while the walk
+    is still going, a search can start on the first file at once, and one
+    that stops early, as quiet mode does, never lists the rest of the tree.
+    Subdirectories whose name matches one of `exclude_dirs`, such as
+    `.git` or `node_modules`, are never listed, which prunes the whole
+    subtree. Handles missing paths or permission errors; subdirectories
+    that cannot be listed are skipped.
+
+    Args:
+        directory (str): Path to the root directory to scan.
+        exclude_dirs (list[str], optional): Glob patterns, as accepted by
+            `fnmatch`, for names of subdirectories to skip. Defaults to
+            None, which skips none.
+
+    Yields:
+        str: Path of each file found in the directory and subdirectories.
+        Nothing is yielded if the directory cannot be read.
+    """
+    try:
+        mode = os.stat(directory).st_mode
+    except (OSError, ValueError):
         print(f"{directory}: no such file or directory", file=sys.stderr)
-        return []
+        return
 
-    if not os.path.isdir(directory):
+    if not stat.S_ISDIR(mode):
         print(f"{directory}: not a directory", file=sys.stderr)
-        return []
+        return
 
-    all_files = []
+    pending = [directory]
 
-    try:
-        for root, _dirs, files in os.walk(directory):
-            for filename in files:
-                filepath = os.path.join(root, filename)
-                all_files.append(filepath)
+    while pending:
+        current = pending.pop()
+        subdirectories = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    # Symlinked directories are not followed, the same as
+                    # os.walk(). FIFOs, sockets, devices and broken links are
+                    # skipped: opening a FIFO would block the whole search.
+                    if entry.is_dir():
+                        if not entry.is_symlink() and not any(
+                            fnmatchcase(entry.name, glob) for glob in exclude_dirs or ()
+                        ):
+                            subdirectories.append(entry.path)
+                    elif entry.is_file() and not _is_binary_file(entry.path):
+                        yield entry.path
+        except OSError:
+            if current == directory:
+                print(f"{directory}: permission denied", file=sys.stderr)
+                return
+            continue
+
+        # Pushed in reverse so they are visited in listing order.
+        pending.extend(reversed(subdirectories))
+
+
+def _is_binary_file(filepath: str) -> bool:
+    """
+    Checks if a file looks binary from its first `BINARY_CHECK_BYTES` bytes.
 
-    except (PermissionError, OSError):
-        print(f"{directory}: permission denied", file=sys.stderr)
-        return []
+    A NUL byte marks the file as binary, the same test GNU grep uses. Text
+    in any ASCII-compatible encoding, including UTF-8, never contains one.
 
-    return all_files
+    Args:
+        filepath (str): Path of the file to check.
+
+    Returns:
+        bool: True if the file contains a NUL byte near its start. Files
+        that cannot be read return False, so `search_file()` reports them.
+    """
+    try:
+        with open(filepath, "rb") as file:
+            return b"\0" in file.read(BINARY_CHECK_BYTES)
+    except OSError:
+        return False
 
 
 def search_directory_recursively(
@@ -418,12 +806,15 @@ def search_directory_recursively(
     files_with_matches: bool = False,
     files_without_match: bool = False,
     collect_results: bool = False,
+    jobs: int = 1,
+    exclude_dirs: Optional[list[str]] = None,
 ) -> bool | list[MatchResult]:
     """
     Recursively search all files in a directory for lines matching a pattern.
 
-    Calls `get_files_recursively()` to collect file paths in a given directory,
-    then calls `search_file()` to find matching lines in each file.
+    Takes file paths from `iter_files_recursively()` and calls
+    `search_file()` to find matching lines in each file as it is found,
+    or in worker processes when `jobs` is more than 1.
     Returns True if a match is found in any of the files.
 
     Args:
@@ -444,57 +835,46 @@ def search_directory_recursively(
             matching lines.
         files_without_match (bool): If True, only print names of files without
             matching lines.
+        jobs (int): Number of worker processes to search files in. Defaults
+            to 1, which searches in this process.
+        exclude_dirs (list[str], optional): Glob patterns for names of
+            subdirectories to skip. Defaults to None.
 
     Returns:
         bool: True if at least one matching line is found, else False.
     """
-    files = get_files_recursively(directory)
+    files = iter_files_recursively(directory, exclude_dirs)
+
+    search_args = {
+        "pattern": pattern,
+        "print_filename": not (files_with_matches or files_without_match),
+        "print_line_number": print_line_number,
+        "ignore_case": ignore_case,
+        "invert_match": invert_match,
+        "count_only": count_only,
+        "after_context": after_context,
+        "before_context": before_context,
+        "patterns": patterns,
+        "quiet": quiet,
+        "max_count": max_count,
+        "files_with_matches": files_with_matches,
+        "files_without_match": files_without_match,
+        "collect_results": collect_results,
+    }
+    file_results = iter_file_results(search_file, files, search_args, jobs)
 
     if collect_results:
         all_results = []
-        for filepath in files:
-            file_results = search_file(
-                filepath,
-                pattern,
-                print_filename=not (files_with_matches or files_without_match),
-                print_line_number=print_line_number,
-                ignore_case=ignore_case,
-                invert_match=invert_match,
-                count_only=count_only,
-                after_context=after_context,
-                before_context=before_context,
-                patterns=patterns,
-                quiet=quiet,
-                max_count=max_count,
-                files_with_matches=files_with_matches,
-                files_without_match=files_without_match,
-                collect_results=True,
-            )
-            if isinstance(file_results, list):
-                all_results.extend(file_results)
+        for results in file_results:
+            if isinstance(results, list):
+                all_results.extend(results)
             if quiet and all_results:
                 return all_results
         return all_results
 
     any_match_found = False
 
-    for filepath in files:
-        file_had_match = search_file(
-            filepath,
-            pattern,
-            print_filename=not (files_with_matches or files_without_match),
-            print_line_number=print_line_number,
-            ignore_case=ignore_case,
-            invert_match=invert_match,
-            count_only=count_only,
-            after_context=after_context,
-            before_context=before_context,
-            patterns=patterns,
-            quiet=quiet,
-            max_count=max_count,
-            files_with_matches=files_with_matches,
-            files_without_match=files_without_match,
-        )
+    for file_had_match in file_results:
         if file_had_match:
             any_match_found = True
             if quiet:
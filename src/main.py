@@ -1,5 +1,5 @@
 import sys
-from .pattern_matcher import match_pattern
+from .pattern_matcher import compile_patterns, match_any
 from .file_search import (
     search_file,
     search_multiple_files,
@@ -13,6 +13,7 @@ from .constants import (
     ERROR_SEARCH_FAILED,
 )
 from .cli import parse_arguments
+from .parallel_search import iter_line_matches, resolve_jobs
 from .output_formatters import JSONFormatter
 
 
@@ -21,29 +22,43 @@ def main() -> None:
     Entry point for the pygrep CLI.
 
     This function dictates the flow of the program. It parses arguments,
-    determines input source and coordinates pattern matching. Calls helper
-    functions: reads from stdin for input, searches file(s) by calling
-    `search_file()` / `search_multiple_files()`, or scans directories with
-    `search_directory_recursively()`. Utilizes standard grep status codes
-    for exit based on results of matching.
+    determines input source and coordinates pattern matching. The patterns
+    are compiled once up front, so an invalid pattern is reported the same
+    way whichever input is searched. Calls helper functions: reads from
+    stdin for input, searches file(s) by calling `search_file()` /
+    `search_multiple_files()`, or scans directories with
+    `search_directory_recursively()`. With `--jobs`, stdin lines are matched
+    in worker processes through `iter_line_matches()`, and multiple files are
+    searched in worker processes through `iter_file_results()`. Utilizes
+    standard grep status codes for exit based on results of matching.
     """
     try:
         args = parse_arguments()
+        jobs = resolve_jobs(args.jobs)
+        patterns_to_check = args.pattern_list if args.pattern_list else [args.pattern]
+
+        try:
+            compiled_patterns = compile_patterns(patterns_to_check, args.ignore_case)
+        except (ValueError, IndexError, KeyError):
+            print(f"grep: {ERROR_INVALID_PATTERN}", file=sys.stderr)
+            sys.exit(EXIT_ERROR)
 
         if len(args.files) == 0:
             match_count = 0
             match_found = False
-            for line in sys.stdin:
-                line = line.rstrip("\n")
-                try:
-                    matches = False
-                    patterns_to_check = (
-                        args.pattern_list if args.pattern_list else [args.pattern]
-                    )
-                    for p in patterns_to_check:
-                        if match_pattern(line, p, ignore_case=args.ignore_case):
-                            matches = True
-                            break
+            stdin_lines = (line.rstrip("\n") for line in sys.stdin)
+            write = sys.stdout.write
+            if jobs > 1:
+                line_results = iter_line_matches(
+                    stdin_lines, patterns_to_check, args.ignore_case, jobs
+                )
+            else:
+                line_results = ((line, None) for line in stdin_lines)
+
+            try:
+                for line, matches in line_results:
+                    if matches is None:
+                        matches = match_any(line, compiled_patterns, args.ignore_case)
 
                     if args.invert_match:
                         matches = not matches
@@ -54,14 +69,14 @@ def main() -> None:
                         if args.quiet:
                             sys.exit(EXIT_MATCH_FOUND)
                         if not args.count:
-                            print(line)
+                            write(line + "\n")
                         if 0 < args.max_count <= match_count:
                             if args.count:
                                 print(match_count)
                             sys.exit(EXIT_MATCH_FOUND)
-                except (ValueError, IndexError, KeyError):
-                    print(f"grep: {ERROR_INVALID_PATTERN}", file=sys.stderr)
-                    sys.exit(EXIT_ERROR)
+            except (ValueError, IndexError, KeyError):
+                print(f"grep: {ERROR_INVALID_PATTERN}", file=sys.stderr)
+                sys.exit(EXIT_ERROR)
 
             if args.count:
                 print(match_count)
@@ -92,6 +107,8 @@ def main() -> None:
                             max_count=args.max_count,
                             files_with_matches=args.files_with_matches,
                             files_without_match=args.files_without_match,
+                            jobs=jobs,
+                            exclude_dirs=args.exclude_dirs,
                             collect_results=True,
                         )
                         if isinstance(results, list):
@@ -134,6 +151,7 @@ def main() -> None:
                         max_count=args.max_count,
                         files_with_matches=args.files_with_matches,
                         files_without_match=args.files_without_match,
+                        jobs=jobs,
                         collect_results=True,
                     )
                     if isinstance(results, list):
@@ -162,6 +180,8 @@ def main() -> None:
                         max_count=args.max_count,
                         files_with_matches=args.files_with_matches,
                         files_without_match=args.files_without_match,
+                        jobs=jobs,
+                        exclude_dirs=args.exclude_dirs,
                     ):
                         any_match_found = True
                 except (PermissionError, OSError, FileNotFoundError):
@@ -212,6 +232,7 @@ def main() -> None:
                         max_count=args.max_count,
                         files_with_matches=args.files_with_matches,
                         files_without_match=args.files_without_match,
+                        jobs=jobs,
                     ):
                         sys.exit(EXIT_MATCH_FOUND)
                     else:
@@ -0,0 +1,207 @@
+import io
+import os
+import sys
+from collections import deque
+from contextlib import redirect_stderr, redirect_stdout
+from functools import partial
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, Iterator
+from .pattern_matcher import CompiledPattern, compile_patterns, match_any
+from .constants import (
+    PARALLEL_BATCH_LINES,
+    PARALLEL_FILES_PER_JOB,
+    PARALLEL_MIN_LINES,
+)
+
+_worker_patterns: list[CompiledPattern] = []
+# Set per worker process by `_init_worker()`, so not a constant.
+# pylint: disable-next=invalid-name
+_worker_ignore_case = False
+
+
+def resolve_jobs(jobs: int) -> int:
+    """
+    Converts the `--jobs` option into a number of worker processes.
+
+    Args:
+        jobs (int): Requested number of jobs. 0 means one per CPU.
+
+    Returns:
+        int: The number of processes to use, at least 1.
+    """
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return max(jobs, 1)
+
+
+def iter_line_matches(
+    lines: Iterable[str], patterns: list[str], ignore_case: bool, jobs: int = 1
+) -> Iterator[tuple[str, bool]]:
+    """
+    Yields each input line together with whether any pattern matches it.
+
+    With one job, lines are matched as they are read, so streaming input is
+    answered line by line. With more jobs, lines are read in batches of
+    `PARALLEL_BATCH_LINES` and matched by a pool of worker processes; batches
+    shorter than `PARALLEL_MIN_LINES` are matched in this process, since
+    handing them to workers costs more than it saves. Results always come
+    back in input order.
+
+    Args:
+        lines (Iterable[str]): Input lines without trailing newlines.
+        patterns (list[str]): Patterns to check; a line matches if any does.
+        ignore_case (bool): If True, ignores case.
+        jobs (int, optional): Number of worker processes. Defaults to 1.
+
+    Yields:
+        tuple[str, bool]: The line and whether it matched.
+    """
+    compiled_patterns = compile_patterns(patterns, ignore_case)
+    if jobs <= 1:
+        for line in lines:
+            yield line, match_any(line, compiled_patterns, ignore_case)
+        return
+
+    lines = iter(lines)
+    executor = None
+    try:
+        while True:
+            batch = list(islice(lines, PARALLEL_BATCH_LINES))
+            if not batch:
+                return
+
+            if len(batch) < PARALLEL_MIN_LINES:
+                results = (
+                    match_any(line, compiled_patterns, ignore_case) for line in batch
+                )
+            else:
+                if executor is None:
+                    # Imported on first use so serial runs skip multiprocessing.
+                    # pylint: disable-next=import-outside-toplevel
+                    from concurrent.futures import ProcessPoolExecutor
+
+                    executor = ProcessPoolExecutor(
+                        max_workers=jobs,
+                        initializer=_init_worker,
+                        initargs=(patterns, ignore_case),
+                    )
+                chunksize = max(len(batch) // (jobs * 4), 1)
+                results = executor.map(_worker_matches, batch, chunksize=chunksize)
+
+            yield from zip(batch, results)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def iter_file_results(
+    search_fn: Callable[..., Any],
+    filenames: Iterable[str],
+    search_args: dict,
+    jobs: int = 1,
+) -> Iterator[Any]:
+    """
+    Yields the result of searching each file, in the order given.
+
+    With one job, or a single file, `search_fn` is called in this process
+    for one file at a time, taking each name from `filenames` only when the
+    previous file is done, so a generator of names is consumed lazily. With
+    more jobs, files are searched by a pool of worker processes, which are
+    kept `PARALLEL_FILES_PER_JOB` files per worker ahead of the result
+    being yielded; a name is only taken from `filenames` when a result is
+    handed out, so a directory walk still streams. Each worker captures
+    what the search prints, and the captured output is written here as each
+    result is yielded, so output appears in file order exactly as in a
+    serial search. Closing the iterator early, as quiet mode does on its
+    first match, cancels files that have not started yet.
+
+    Args:
+        search_fn (Callable[..., Any]): Module-level function called as
+            `search_fn(filename, **search_args)`, such as `search_file()`.
+        filenames (Iterable[str]): Paths of files to search.
+        search_args (dict): Keyword arguments passed to every call.
+        jobs (int, optional): Number of worker processes. Defaults to 1.
+
+    Yields:
+        Any: The return value of `search_fn` for each file.
+    """
+    filenames = iter(filenames)
+    head = list(islice(filenames, 2)) if jobs > 1 else []
+    if len(head) < 2:
+        for filename in chain(head, filenames):
+            yield search_fn(filename, **search_args)
+        return
+
+    # Imported on first use so serial runs skip multiprocessing.
+    # pylint: disable-next=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor
+
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        worker = partial(_captured_search, search_fn, search_args=search_args)
+        filenames = chain(head, filenames)
+        pending = deque(
+            executor.submit(worker, filename)
+            for filename in islice(filenames, jobs * PARALLEL_FILES_PER_JOB)
+        )
+        while pending:
+            output, errors, result = pending.popleft().result()
+            for filename in islice(filenames, 1):
+                pending.append(executor.submit(worker, filename))
+            sys.stdout.write(output)
+            sys.stderr.write(errors)
+            yield result
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _captured_search(
+    search_fn: Callable[..., Any], filename: str, search_args: dict
+) -> tuple[str, str, Any]:
+    """
+    Searches one file in a worker process, capturing what it prints.
+
+    Args:
+        search_fn (Callable[..., Any]): The search function to call.
+        filename (str): Path of the file to search.
+        search_args (dict): Keyword arguments for `search_fn`.
+
+    Returns:
+        tuple[str, str, Any]: Captured standard output, captured standard
+        error and the return value of `search_fn`.
+    """
+    output = io.StringIO()
+    errors = io.StringIO()
+    with redirect_stdout(output), redirect_stderr(errors):
+        result = search_fn(filename, **search_args)
+    return output.getvalue(), errors.getvalue(), result
+
+
+def _init_worker(patterns: list[str], ignore_case: bool) -> None:
+    """
+    Compiles the search settings in a worker process.
+
+    Runs once per worker, so each line sent to it only carries its text.
+    Compiled patterns hold generated functions that cannot be pickled, so
+    each worker compiles its own copy from the pattern strings.
+
+    Args:
+        patterns (list[str]): Patterns to check.
+        ignore_case (bool): If True, ignores case.
+    """
+    global _worker_patterns, _worker_ignore_case  # pylint: disable=global-statement
+    _worker_patterns = compile_patterns(patterns, ignore_case)
+    _worker_ignore_case = ignore_case
+
+
+def _worker_matches(line: str) -> bool:
+    """
+    Matches a line against the patterns stored by `_init_worker()`.
+
+    Args:
+        line (str): The line to test.
+
+    Returns:
+        bool: True if at least one pattern matches.
+    """
+    return match_any(line, _worker_patterns, _worker_ignore_case)
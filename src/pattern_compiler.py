@@ -0,0 +1,828 @@
+import re
+from typing import Callable, Optional
+from .constants import (
+    OP_CHAR,
+    OP_PLUS,
+    OP_OPT,
+    OP_SPLIT,
+    OP_JMP,
+    OP_GROUP_START,
+    OP_GROUP_END,
+    OP_REPEAT,
+    OP_BACKREF,
+    OP_MATCH,
+    OP_BOUNDED,
+    MAX_DFA_STATES,
+)
+from .pattern_parser import parse_class, ranges_to_expression, TABLE_SIZE
+
+
+def compile_tokens(tokens: list[dict]) -> list[tuple]:
+    """
+    Lowers a parsed token list into a flat program for the matching engine.
+
+    Each instruction is a tuple `(opcode, arg, arg2)`. Groups and alternation
+    are flattened into `OP_SPLIT`/`OP_JMP` control flow so the matcher can walk
+    the program with a program counter instead of recursing into nested token
+    lists. Single-character tokens keep a reference to their token dictionary,
+    which is passed to `character_matches_token()` at match time. `OP_CHAR`
+    and `OP_OPT` carry the token's lookup table as their second argument so
+    the matcher can test most characters without a function call, and
+    `OP_PLUS` carries the token's `atomic` flag. Runs of identical optional
+    tokens become a single `OP_BOUNDED` instruction carrying the run length.
+
+    Args:
+        tokens (list[dict]): Parsed regex tokens from `parse_pattern()`.
+
+    Returns:
+        list[tuple]: The compiled program, terminated by an `OP_MATCH`
+        instruction.
+    """
+    program = []
+    _emit_sequence(tokens, program)
+    program.append((OP_MATCH, None, None))
+    return program
+
+
+def to_columns(program: list[tuple]) -> tuple[list, list, list, list]:
+    """
+    Splits a program into parallel lists of opcodes and arguments.
+
+    The matcher reads the opcode of every instruction it executes but only
+    some of the arguments, so indexing separate lists avoids unpacking a
+    whole tuple per step. A fourth column holds the result of
+    `calculate_min_remaining()` for each instruction.
+
+    Args:
+        program (list[tuple]): Compiled program from `compile_tokens()`.
+
+    Returns:
+        tuple[list, list, list, list]: The opcodes, first arguments, second
+        arguments and minimum remaining lengths, indexed by program counter.
+    """
+    opcodes = [instruction[0] for instruction in program]
+    args = [instruction[1] for instruction in program]
+    args2 = [instruction[2] for instruction in program]
+    return opcodes, args, args2, calculate_min_remaining(program)
+
+
+def calculate_min_remaining(program: list[tuple]) -> list[int]:
+    """
+    Computes how many characters each instruction still needs to reach a match.
+
+    Entry `pc` is the fewest characters any path from instruction `pc` to
+    `OP_MATCH` consumes. Every path can be taken, so the value is a safe
+    bound: when fewer characters than that are left on the line, the match
+    attempt from `pc` is bound to fail. Loops jump backwards, so the values
+    are relaxed until they stop changing.
+
+    Args:
+        program (list[tuple]): Compiled program from `compile_tokens()`.
+
+    Returns:
+        list[int]: The minimum remaining length, indexed by program counter.
+    """
+    program_len = len(program)
+    min_remaining = [program_len] * program_len
+    changed = True
+
+    while changed:
+        changed = False
+        for pc in range(program_len - 1, -1, -1):
+            opcode, arg, arg2 = program[pc]
+            if opcode == OP_MATCH:
+                length = 0
+            elif opcode in (OP_CHAR, OP_PLUS):
+                length = 1 + min_remaining[pc + 1]
+            elif opcode == OP_SPLIT:
+                length = min(min_remaining[arg], min_remaining[arg2])
+            elif opcode == OP_JMP:
+                length = min_remaining[arg]
+            elif opcode == OP_REPEAT:
+                length = min(min_remaining[pc + 1], min_remaining[arg])
+            else:
+                length = min_remaining[pc + 1]
+
+            if length < min_remaining[pc]:
+                min_remaining[pc] = length
+                changed = True
+
+    return min_remaining
+
+
+def generate_fixed_matcher(
+    program: list[tuple], match_fn: Callable
+) -> Optional[Callable]:
+    """
+    Generates a specialized matcher for programs of plain single characters.
+
+    Patterns such as `\\d\\d-\\d\\d` compile to nothing but `OP_CHAR`
+    instructions, so they match a fixed number of characters and never
+    backtrack. For those, Python source with one unrolled check per
+    instruction is generated and compiled once: literals become a direct
+    character comparison and other tokens index their lookup table, falling
+    back to `match_fn` beyond the table range.
+
+    Args:
+        program (list[tuple]): Compiled program from `compile_tokens()`.
+        match_fn (Callable): Character test for code points beyond the table,
+            normally `character_matches_token()`.
+
+    Returns:
+        Optional[Callable]: A function `(line, j) -> bool` that checks the
+        pattern at position `j`, which the caller must leave room for, or
+        None if the program contains any other instruction.
+    """
+    if any(op != OP_CHAR for op, _, _ in program[:-1]):
+        return None
+
+    namespace = {"match_fn": match_fn}
+    lines = ["def match_at(line, j):"]
+    for index, (_, token, table) in enumerate(program[:-1]):
+        if token["type"] == "literal":
+            lines.append(f"    if line[j + {index}] != {token['value']!r}:")
+        else:
+            namespace[f"table_{index}"] = table
+            namespace[f"token_{index}"] = token
+            lines.append(f"    char = line[j + {index}]")
+            lines.append("    code = ord(char)")
+            lines.append(
+                f"    if not (table_{index}[code] if code < {TABLE_SIZE} "
+                f"else match_fn(char, token_{index})):"
+            )
+        lines.append("        return False")
+    lines.append("    return True")
+
+    # The source is built only from the program's own literals (through repr)
+    # and generated names, never from other input, and runs in a namespace
+    # holding just the tables and tokens it refers to.
+    # pylint: disable-next=exec-used
+    exec(compile("\n".join(lines), "<pattern>", "exec"), namespace)
+    return namespace["match_at"]
+
+
+def _emit_sequence(tokens: list[dict], program: list) -> None:
+    """
+    Appends the instructions for a sequence of tokens to `program`.
+
+    Args:
+        tokens (list[dict]): Tokens to compile, in matching order.
+        program (list): The program being built. Modified in place.
+    """
+    token_count = len(tokens)
+    index = 0
+    while index < token_count:
+        token = tokens[index]
+        index += 1
+        token_type = token["type"]
+        quantifier = token.get("quantifier")
+
+        if token_type == "group":
+            if quantifier == "?":
+                split_index = len(program)
+                program.append(None)
+                _emit_group(token, program)
+                program[split_index] = (OP_SPLIT, split_index + 1, len(program))
+            elif quantifier == "+":
+                loop_start = len(program)
+                _emit_group(token, program)
+                program.append((OP_REPEAT, loop_start, token["number"]))
+            else:
+                _emit_group(token, program)
+
+        elif token_type == "backreference":
+            number = token["number"]
+            if quantifier == "?":
+                split_index = len(program)
+                program.append((OP_SPLIT, split_index + 1, split_index + 2))
+                program.append((OP_BACKREF, number, False))
+            elif quantifier == "+":
+                program.append((OP_BACKREF, number, False))
+                loop_start = len(program)
+                program.append((OP_SPLIT, loop_start + 1, loop_start + 3))
+                program.append((OP_BACKREF, number, True))
+                program.append((OP_JMP, loop_start, None))
+            else:
+                program.append((OP_BACKREF, number, False))
+
+        elif quantifier == "+":
+            program.append((OP_PLUS, token, token.get("atomic", False)))
+        elif quantifier == "?":
+            # A run like `a?a?a?` only needs to try 3, 2, 1 or 0 characters,
+            # not every subset, so it becomes one bounded instruction.
+            run_length = 1
+            while index < token_count and _is_same_optional(tokens[index], token):
+                run_length += 1
+                index += 1
+            if run_length > 1:
+                program.append((OP_BOUNDED, token, run_length))
+            else:
+                program.append((OP_OPT, token, token["table"]))
+        else:
+            program.append((OP_CHAR, token, token["table"]))
+
+
+def _is_same_optional(token: dict, other: dict) -> bool:
+    """
+    Checks if `token` is an optional single-character token equal to `other`.
+
+    Args:
+        token (dict): The token to check.
+        other (dict): An optional single-character token.
+
+    Returns:
+        bool: True if both tokens are optional and accept the same characters.
+    """
+    return (
+        token.get("quantifier") == "?"
+        and token["type"] == other["type"]
+        and token.get("value") == other.get("value")
+    )
+
+
+def _emit_group(token: dict, program: list) -> None:
+    """
+    Appends the instructions for a capturing group and its alternatives.
+
+    The alternatives are emitted by `_emit_alternatives()`, between the
+    instructions that record the group's capture.
+
+    Args:
+        token (dict): A group token with `alternatives` and `number`.
+        program (list): The program being built. Modified in place.
+    """
+    number = token["number"]
+    program.append((OP_GROUP_START, number, None))
+    _emit_alternatives(token["alternatives"], program)
+    program.append((OP_GROUP_END, number, None))
+
+
+def _emit_alternatives(alternatives: list[list[dict]], program: list) -> None:
+    """
+    Appends the instructions for a list of alternatives as a prefix trie.
+
+    Alternatives that start with the same plain single-character token share
+    one instruction for it, followed by their remaining tokens as nested
+    alternatives, so `(abc|abd|ae)` tests `a` once and `b` once instead of
+    re-matching them for every alternative. Every branch but the last is
+    preceded by an `OP_SPLIT` that falls through to the next branch on
+    backtracking, and followed by an `OP_JMP` past the last branch.
+
+    Args:
+        alternatives (list[list[dict]]): Parsed tokens of each alternative.
+        program (list): The program being built. Modified in place.
+    """
+    branches = []
+    branch_by_key = {}
+    for alt_tokens in alternatives:
+        key = _shared_token_key(alt_tokens[0]) if alt_tokens else None
+        if key is None:
+            branches.append((None, [alt_tokens]))
+        elif key in branch_by_key:
+            branch_by_key[key][1].append(alt_tokens[1:])
+        else:
+            branch = (alt_tokens[0], [alt_tokens[1:]])
+            branch_by_key[key] = branch
+            branches.append(branch)
+
+    last_index = len(branches) - 1
+    jump_indices = []
+
+    for branch_index, (shared_token, tails) in enumerate(branches):
+        split_index = len(program)
+        if branch_index != last_index:
+            program.append(None)
+
+        if shared_token is None:
+            _emit_sequence(tails[0], program)
+        else:
+            program.append((OP_CHAR, shared_token, shared_token["table"]))
+            if len(tails) == 1:
+                _emit_sequence(tails[0], program)
+            else:
+                _emit_alternatives(tails, program)
+
+        if branch_index != last_index:
+            jump_indices.append(len(program))
+            program.append(None)
+            program[split_index] = (OP_SPLIT, split_index + 1, len(program))
+
+    branches_end = len(program)
+    for jump_index in jump_indices:
+        program[jump_index] = (OP_JMP, branches_end, None)
+
+
+def _shared_token_key(token: dict) -> Optional[tuple]:
+    """
+    Gives the key under which alternatives may share their first token.
+
+    Args:
+        token (dict): The first token of an alternative.
+
+    Returns:
+        Optional[tuple]: `(type, value)` for an unquantified single-character
+        token, or None for any other token.
+    """
+    if "table" not in token or "quantifier" in token:
+        return None
+    return token["type"], token.get("value")
+
+
+def build_nfa(program: list[tuple]) -> tuple[list[tuple], tuple[int, ...], bool]:
+    """
+    Builds a Thompson-style NFA from a compiled program without backreferences.
+
+    Only the character-consuming instructions (`OP_CHAR`, `OP_PLUS`, `OP_OPT`
+    and `OP_BOUNDED`, which gets one state per character of its run) become
+    NFA states; every other instruction is an epsilon move
+    and is folded into precomputed epsilon closures. Groups only record
+    captures, so they are skipped, and `OP_REPEAT` loops back to the start of
+    its group unconditionally.
+
+    Each state is a tuple `(token, table, targets, accepts)`: the token and its
+    lookup table decide whether a character is consumed, `targets` holds the
+    states active after consuming it and `accepts` is True if `OP_MATCH` is
+    reachable from there.
+
+    Args:
+        program (list[tuple]): Compiled program from `compile_tokens()`.
+
+    Returns:
+        tuple[list[tuple], tuple[int, ...], bool]:
+            - The NFA states.
+            - The states active before any character is consumed.
+            - True if the program matches without consuming any character.
+
+    Raises:
+        ValueError: If the program contains backreferences.
+    """
+    state_ids = {}
+    state_count = 0
+    for pc, (op, _, arg2) in enumerate(program):
+        if op == OP_BACKREF:
+            raise ValueError("NFA programs cannot contain backreferences")
+        if op in (OP_CHAR, OP_PLUS, OP_OPT, OP_BOUNDED):
+            state_ids[pc] = state_count
+            state_count += 1 if op != OP_BOUNDED else arg2
+
+    closures = {}
+    nfa_states = []
+    for pc, state_id in state_ids.items():
+        op, token, arg2 = program[pc]
+        targets, accepts = _epsilon_closure(program, state_ids, pc + 1, closures)
+        if op == OP_PLUS:
+            targets = (state_id,) + tuple(t for t in targets if t != state_id)
+        if op == OP_BOUNDED:
+            # One state per position in the run; each of them may be skipped.
+            last_id = state_id + arg2
+            for run_id in range(state_id, last_id):
+                run_targets = tuple(range(run_id + 1, last_id)) + targets
+                nfa_states.append((token, token["table"], run_targets, accepts))
+        else:
+            nfa_states.append((token, token["table"], targets, accepts))
+
+    start_states, start_accepts = _epsilon_closure(program, state_ids, 0, closures)
+    return nfa_states, start_states, start_accepts
+
+
+def build_nfa_masks(
+    states: list[tuple], start_states: tuple[int, ...]
+) -> tuple[list[int], list[int], int, int]:
+    """
+    Encodes an NFA from `build_nfa()` as integer bitmasks over its states.
+
+    Bit `i` of a mask stands for NFA state `i`, so a set of active states is a
+    single `int` and set operations become bitwise operations. Python ints are
+    unbounded, so this works for any number of states.
+
+    Args:
+        states (list[tuple]): NFA states from `build_nfa()`.
+        start_states (tuple[int, ...]): The initially active states.
+
+    Returns:
+        tuple[list[int], list[int], int, int]:
+            - For each code point below `TABLE_SIZE`, the states that accept it.
+            - For each state, the states active after it consumes a character.
+            - The states that reach `OP_MATCH` after consuming a character.
+            - The initially active states.
+    """
+    char_masks = [0] * TABLE_SIZE
+    target_masks = []
+    accept_mask = 0
+
+    for state_id, (_, table, targets, accepts) in enumerate(states):
+        bit = 1 << state_id
+        for code in range(TABLE_SIZE):
+            if table[code]:
+                char_masks[code] |= bit
+        target_masks.append(_to_mask(targets))
+        if accepts:
+            accept_mask |= bit
+
+    return char_masks, target_masks, accept_mask, _to_mask(start_states)
+
+
+class LazyDfa:
+    """
+    A DFA over sets of NFA states, built on demand while lines are matched.
+
+    Each DFA state stands for one bitmask of active NFA states from
+    `build_nfa_masks()`. Transitions are computed the first time a state
+    sees a character and cached in a row of `TABLE_SIZE` entries, so once
+    the states a pattern actually reaches are built, matching takes one list
+    lookup per character. Characters beyond the table are cached per state
+    in the dictionaries of `wide_rows`. The cache lives as long as the compiled pattern,
+    so it is shared by every line searched with it.
+
+    A transition entry is `(next_state << 1) | accepted`, where `accepted` is
+    1 if consuming the character reaches `OP_MATCH`. Unknown transitions are
+    -1. Unless the pattern starts with `^`, the NFA start states are added to
+    every non-empty state, so a match may begin at any position; the empty
+    state is `dead` and means no match is in progress.
+
+    Args:
+        nfa (tuple): The NFA from `build_nfa()`.
+        nfa_masks (tuple): The same NFA encoded by `build_nfa_masks()`.
+        has_start_anchor (bool): True if the pattern starts with `^`.
+        match_fn (Callable): Tests a character against a token, normally
+            `character_matches_token()`. Used for characters beyond the
+            lookup tables.
+        max_states (int, optional): Most DFA states to build. Defaults to
+            `MAX_DFA_STATES`.
+    """
+
+    # The NFA masks and the state cache are read on every transition, so
+    # they stay plain attributes rather than being grouped behind another
+    # object.
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        nfa: tuple,
+        nfa_masks: tuple,
+        has_start_anchor: bool,
+        match_fn: Callable,
+        max_states: int = MAX_DFA_STATES,
+    ):
+        self.nfa_states = nfa[0]
+        self.char_masks, self.target_masks, self.accept_mask, start_mask = nfa_masks
+        self.reinject_mask = 0 if has_start_anchor else start_mask
+        self.match_fn = match_fn
+        self.max_states = max_states
+        self.masks = []
+        self.rows = []
+        self.wide_rows = []
+        self.state_ids = {}
+        self.dead = self._add_state(0)
+        self.start = self._add_state(start_mask)
+
+    def transition(self, state: int, code: int) -> int:
+        """
+        Computes and caches the transition of a state on a code point.
+
+        Args:
+            state (int): The current DFA state.
+            code (int): A code point below `TABLE_SIZE`.
+
+        Returns:
+            int: The transition entry, or -1 if building the next state
+            would exceed `max_states`.
+        """
+        consuming = self.masks[state] & self.char_masks[code]
+        entry = self._follow(consuming)
+        if entry != -1:
+            self.rows[state][code] = entry
+        return entry
+
+    def transition_char(self, state: int, char: str) -> int:
+        """
+        Computes and caches the transition of a state on a wide character.
+
+        Args:
+            state (int): The current DFA state.
+            char (str): A character with a code point of `TABLE_SIZE` or more.
+
+        Returns:
+            int: The transition entry, or -1 if building the next state
+            would exceed `max_states`.
+        """
+        mask = self.masks[state]
+        consuming = 0
+        for state_id, nfa_state in enumerate(self.nfa_states):
+            if mask >> state_id & 1 and self.match_fn(char, nfa_state[0]):
+                consuming |= 1 << state_id
+        entry = self._follow(consuming)
+        if entry != -1:
+            self.wide_rows[state][char] = entry
+        return entry
+
+    def _follow(self, consuming: int) -> int:
+        """
+        Builds the transition entry for a set of consuming NFA states.
+
+        Args:
+            consuming (int): Bitmask of the NFA states that consumed the
+                character.
+
+        Returns:
+            int: The transition entry, or -1 if the next state is new and
+            the DFA is full.
+        """
+        accepted = 1 if consuming & self.accept_mask else 0
+        active = 0
+        target_masks = self.target_masks
+        while consuming:
+            lowest = consuming & -consuming
+            active |= target_masks[lowest.bit_length() - 1]
+            consuming ^= lowest
+        if active:
+            active |= self.reinject_mask
+
+        next_state = self.state_ids.get(active)
+        if next_state is None:
+            if len(self.masks) >= self.max_states:
+                return -1
+            next_state = self._add_state(active)
+        return next_state << 1 | accepted
+
+    def _add_state(self, mask: int) -> int:
+        """
+        Registers a new DFA state for a set of active NFA states.
+
+        Args:
+            mask (int): Bitmask of the active NFA states.
+
+        Returns:
+            int: The id of the new state.
+        """
+        state = len(self.masks)
+        self.masks.append(mask)
+        self.rows.append([-1] * TABLE_SIZE)
+        self.wide_rows.append({})
+        self.state_ids[mask] = state
+        return state
+
+
+def _to_mask(state_ids: tuple[int, ...]) -> int:
+    """
+    Packs a collection of NFA state ids into a bitmask.
+
+    Args:
+        state_ids (tuple[int, ...]): The state ids.
+
+    Returns:
+        int: A mask with bit `i` set for every state id `i`.
+    """
+    mask = 0
+    for state_id in state_ids:
+        mask |= 1 << state_id
+    return mask
+
+
+def _epsilon_closure(
+    program: list[tuple], state_ids: dict[int, int], start_pc: int, closures: dict
+) -> tuple[tuple[int, ...], bool]:
+    """
+    Collects the NFA states reachable from `start_pc` without consuming input.
+
+    Args:
+        program (list[tuple]): The compiled program.
+        state_ids (dict[int, int]): NFA state id of each consuming instruction.
+        start_pc (int): Index of the instruction to start from.
+        closures (dict): Cache of closures already computed, keyed on `pc`.
+
+    Returns:
+        tuple[tuple[int, ...], bool]: The reachable NFA states, and True if
+        `OP_MATCH` is reachable.
+    """
+    if start_pc in closures:
+        return closures[start_pc]
+
+    states = []
+    accepts = False
+    seen = set()
+    pending = [start_pc]
+    while pending:
+        pc = pending.pop()
+        if pc in seen:
+            continue
+        seen.add(pc)
+        op, arg, arg2 = program[pc]
+
+        if op == OP_MATCH:
+            accepts = True
+        elif op == OP_SPLIT:
+            pending.extend((arg2, arg))
+        elif op == OP_JMP:
+            pending.append(arg)
+        elif op == OP_REPEAT:
+            pending.extend((pc + 1, arg))
+        elif op in (OP_GROUP_START, OP_GROUP_END):
+            pending.append(pc + 1)
+        elif op == OP_BOUNDED:
+            states.extend(range(state_ids[pc], state_ids[pc] + arg2))
+            pending.append(pc + 1)
+        else:
+            states.append(state_ids[pc])
+            if op == OP_OPT:
+                pending.append(pc + 1)
+
+    closures[start_pc] = (tuple(states), accepts)
+    return closures[start_pc]
+
+
+def calculate_min_match_length(tokens: list[dict]) -> int:
+    """
+    Count minimum number of characters required to match a sequence of tokens.
+
+    Evaluates the tokens and accounts for quantifiers ('+', '?') and grouped
+    alternatives, using the `min_length` the parser stores on group tokens and
+    only recursing into groups that lack it. Backreferences count as zero
+    characters, since the group they repeat may have captured empty text.
+    The minimum length is utilized to determine valid starting positions
+    when scanning input, thereby skipping positions where a match is
+    impossible.
+
+    Args:
+        tokens (list[dict]): A list of parsed regex tokens representing the pattern.
+
+    Returns:
+        int: The minimum number of characters required to match the token sequence.
+    """
+    length = 0
+    for token in tokens:
+        token_type = token["type"]
+        quantifier = token.get("quantifier")
+
+        if token_type == "group":
+            group_min = token.get("min_length")
+            if group_min is None:
+                alternatives = token["alternatives"]
+                min_alt_lengths = [
+                    calculate_min_match_length(alt) for alt in alternatives
+                ]
+                group_min = min(min_alt_lengths)
+
+            if quantifier == "?":
+                length += 0
+            elif quantifier == "+":
+                length += group_min
+            else:
+                length += group_min
+
+        elif token_type == "backreference":
+            length += 0
+
+        else:
+            if quantifier == "?":
+                length += 0
+            elif quantifier == "+":
+                length += 1
+            else:
+                length += 1
+
+    return length
+
+
+def calculate_literal_prefix(tokens: list[dict]) -> str:
+    """
+    Collects the literal text at the start of a token sequence.
+
+    Takes the leading run of unquantified literal tokens. Every match of the
+    pattern begins with this text, which lets the matcher jump between
+    candidate start positions with `str.find()` instead of trying each index.
+
+    Args:
+        tokens (list[dict]): A list of parsed regex tokens representing the pattern.
+
+    Returns:
+        str: The literal prefix, or an empty string if the pattern does not
+        start with a literal.
+    """
+    prefix = []
+    for token in tokens:
+        if token["type"] != "literal" or token.get("quantifier") is not None:
+            break
+        prefix.append(token["value"])
+
+    return "".join(prefix)
+
+
+def calculate_required_literal(tokens: list[dict]) -> str:
+    """
+    Finds the longest literal text that every match of a pattern contains.
+
+    Looks at runs of literal tokens at the top level of the pattern, which
+    every match must pass through in order. An unquantified literal extends
+    the current run. A literal with `+` ends the run, since its first
+    repetition directly follows the text before it, and also starts the
+    next one, since its last repetition directly precedes the text after
+    it. Any other token ends the run. For `\\d+ error: x+yz` this is
+    `" error: x"`.
+
+    A line without this text cannot match, so the matcher and file search
+    can reject it with a plain substring search.
+
+    Args:
+        tokens (list[dict]): A list of parsed regex tokens representing the pattern.
+
+    Returns:
+        str: The longest required literal, or an empty string if the
+        pattern has none.
+    """
+    longest = ""
+    run = []
+    for token in tokens:
+        quantifier = token.get("quantifier")
+        if token["type"] == "literal" and quantifier != "?":
+            run.append(token["value"])
+            if quantifier is None:
+                continue
+
+        text = "".join(run)
+        if len(text) > len(longest):
+            longest = text
+        run = (
+            [token["value"]] if token["type"] == "literal" and quantifier == "+" else []
+        )
+
+    text = "".join(run)
+    return text if len(text) > len(longest) else longest
+
+
+def build_start_search(tokens: list[dict]) -> Optional[Callable]:
+    """
+    Builds a search function for the positions where a match can start.
+
+    Used when the pattern has no literal prefix but every match must start
+    with one of a known set of characters, e.g. `\\d+`, `[abc]x` or
+    `(fox|cat)`. The set is collected by `_first_char_members()`, looking
+    into groups and past optional tokens. The result is the `search`
+    method of a compiled `re` character class that accepts at least every
+    character in that set, so the scan for candidate starts runs in C.
+    Tokens that may accept code points beyond the lookup table include the
+    whole range above it.
+
+    Args:
+        tokens (list[dict]): A list of parsed regex tokens representing the pattern.
+
+    Returns:
+        Optional[Callable]: `search(line, pos, endpos)` returning the next
+        candidate as a match object, or None if a match could start with
+        any character or consume none at all.
+    """
+    members, nullable = _first_char_members(tokens)
+    if not members or nullable:
+        return None
+
+    return re.compile(f"[{members}]").search
+
+
+def _first_char_members(tokens: list[dict]) -> tuple[Optional[str], bool]:
+    """
+    Collects the characters a match of a token sequence can start with.
+
+    Walks the tokens until one must consume a character, adding the first
+    characters of every optional token and group alternative passed on the
+    way.
+
+    Args:
+        tokens (list[dict]): A list of parsed regex tokens.
+
+    Returns:
+        tuple[Optional[str], bool]: The members of an `re` character class
+        covering every possible first character, or None if a backreference
+        makes the set unknown; and whether the sequence can match without
+        consuming any character.
+    """
+    members = []
+    for token in tokens:
+        token_type = token["type"]
+        if token_type == "backreference":
+            return None, True
+
+        if token_type == "group":
+            nullable = token.get("quantifier") == "?"
+            for alternative in token["alternatives"]:
+                alt_members, alt_nullable = _first_char_members(alternative)
+                if alt_members is None:
+                    return None, True
+                members.append(alt_members)
+                nullable = nullable or alt_nullable
+        else:
+            if token_type == "literal":
+                members.append(re.escape(token["value"]))
+            elif token_type == "char_class" and not token["value"].startswith("[^"):
+                members.append(ranges_to_expression(parse_class(token["value"])[0]))
+            else:
+                table = token["table"]
+                members.extend(
+                    re.escape(chr(code)) for code in range(TABLE_SIZE) if table[code]
+                )
+                members.append(f"\\u{TABLE_SIZE:04x}-\\U0010ffff")
+            nullable = token.get("quantifier") == "?"
+
+        if not nullable:
+            return "".join(members), False
+
+    return "".join(members), True
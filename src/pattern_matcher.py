@@ -1,536 +1,821 @@
-from .pattern_parser import parse_pattern
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional
+from .pattern_parser import (
+    parse_pattern,
+    parse_class,
+    merge_single_char_alternatives,
+    TABLE_SIZE,
+)
+from .pattern_compiler import (
+    compile_tokens,
+    to_columns,
+    generate_fixed_matcher,
+    build_nfa,
+    build_nfa_masks,
+    LazyDfa,
+    calculate_min_match_length,
+    calculate_literal_prefix,
+    calculate_required_literal,
+    build_start_search,
+)
+from .constants import (
+    OP_CHAR,
+    OP_PLUS,
+    OP_OPT,
+    OP_SPLIT,
+    OP_JMP,
+    OP_GROUP_START,
+    OP_GROUP_END,
+    OP_BACKREF,
+    OP_MATCH,
+    OP_BOUNDED,
+    MAX_VISITED_STATES,
+)
+
+
+@dataclass(frozen=True)
+class CompiledPattern:
+    """
+    A pattern parsed and compiled once, ready to be matched against many lines.
+
+    Args:
+        program (list[tuple]): The program produced by `compile_tokens()`.
+        columns (tuple[list, list, list, list]): The same program split
+            into columns by `to_columns()`, as run by `try_match()`.
+        has_start_anchor (bool): True if the pattern starts with `^`.
+        has_end_anchor (bool): True if the pattern ends with `$`.
+        min_length (int): Minimum number of characters a match consumes.
+        uses_backrefs (bool): True if the program contains backreferences.
+        capture_slots (int): Length of the captures list `try_match()`
+            needs: one more than the highest group number in the program.
+        prefix (str): Literal text every match starts with, or "" if none.
+        required (str): The longest literal text every match contains, or
+            "" if none. At least as long as `prefix`.
+        start_search (Optional[Callable]): Finds the next position where the
+            first token can match when there is no literal prefix, or None.
+        nfa (Optional[tuple]): The NFA from `build_nfa()`, or None if the
+            pattern uses backreferences.
+        nfa_masks (Optional[tuple]): The NFA encoded by `build_nfa_masks()`,
+            or None if the pattern uses backreferences.
+        dfa (Optional[LazyDfa]): Lazily built DFA over the NFA, or None if
+            the pattern uses backreferences.
+        fixed_matcher (Optional[Callable]): Generated matcher from
+            `generate_fixed_matcher()` for patterns of plain single
+            characters, or None.
+    """
+
+    # Every field is precomputed once per pattern so that matching a line
+    # only reads attributes; splitting them into sub-objects would add a
+    # lookup to the per-line paths.
+    # pylint: disable=too-many-instance-attributes
+
+    program: list[tuple]
+    columns: tuple[list, list, list, list]
+    has_start_anchor: bool
+    has_end_anchor: bool
+    min_length: int
+    uses_backrefs: bool
+    capture_slots: int
+    prefix: str
+    required: str
+    start_search: Optional[Callable]
+    nfa: Optional[tuple]
+    nfa_masks: Optional[tuple]
+    dfa: Optional[LazyDfa]
+    fixed_matcher: Optional[Callable]
+
+
+@lru_cache(maxsize=1024)
+def compile_pattern(pattern: str, ignore_case: bool = False) -> CompiledPattern:
+    """
+    Parses and compiles a pattern, caching the result per pattern string.
+
+    Searching a file calls `match_pattern()` once per line with the same
+    pattern, so the parse and compile steps only run on the first line.
+
+    Args:
+        pattern (str): The regex pattern to compile.
+        ignore_case (bool, optional): If True, compiles the pattern for
+            matching lowercased lines (see `parse_pattern()`'s `fold_case`).
+            Defaults to False.
+
+    Returns:
+        CompiledPattern: The compiled pattern and its precomputed properties.
+    """
+    tokens, has_start_anchor, has_end_anchor = parse_pattern(
+        pattern, fold_case=ignore_case
+    )
+    return _compile_parsed(tokens, has_start_anchor, has_end_anchor)
+
+
+@lru_cache(maxsize=256)
+def compile_pattern_set(
+    patterns: tuple[str, ...], ignore_case: bool = False
+) -> CompiledPattern:
+    """
+    Compiles several patterns into one pattern that matches any of them.
+
+    Each pattern is parsed on its own and becomes one alternative of a
+    single group, as if written `(p1|p2|...)`. Building the group from the
+    parsed tokens, rather than joining the strings, keeps patterns such as
+    `a)` or a trailing backslash meaning what they meant alone. Group
+    numbers continue from one pattern to the next. Alternatives that are
+    all single characters become one character class, as in
+    `parse_pattern()`.
+
+    The patterns must not use anchors or backreferences: an anchor only
+    applies to a whole pattern, and backreference numbers would point at
+    the wrong groups once renumbered.
+
+    Args:
+        patterns (tuple[str, ...]): The regex patterns to combine.
+        ignore_case (bool, optional): If True, compiles the patterns for
+            matching lowercased lines. Defaults to False.
+
+    Returns:
+        CompiledPattern: A pattern matching every line one of `patterns`
+        matches.
+    """
+    group_number = [1]
+    alternatives = [
+        parse_pattern(pattern, group_number, fold_case=ignore_case)[0]
+        for pattern in patterns
+    ]
+    token = merge_single_char_alternatives(alternatives)
+    if token is None:
+        token = {
+            "type": "group",
+            "alternatives": alternatives,
+            "number": 1,
+            "min_length": min(
+                calculate_min_match_length(alt_tokens) for alt_tokens in alternatives
+            ),
+        }
+    return _compile_parsed([token], False, False)
+
+
+def _compile_parsed(
+    tokens: list[dict], has_start_anchor: bool, has_end_anchor: bool
+) -> CompiledPattern:
+    """
+    Compiles parsed tokens and precomputes everything the matcher needs.
+
+    Args:
+        tokens (list[dict]): Tokens from `parse_pattern()`.
+        has_start_anchor (bool): True if the pattern starts with `^`.
+        has_end_anchor (bool): True if the pattern ends with `$`.
+
+    Returns:
+        CompiledPattern: The compiled pattern and its precomputed properties.
+    """
+    program = compile_tokens(tokens)
+    uses_backrefs = any(instruction[0] == OP_BACKREF for instruction in program)
+    group_numbers = [
+        instruction[1]
+        for instruction in program
+        if instruction[0] in (OP_GROUP_END, OP_BACKREF)
+    ]
+    nfa = None if uses_backrefs else build_nfa(program)
+    nfa_masks = None if nfa is None else build_nfa_masks(nfa[0], nfa[1])
+    return CompiledPattern(
+        program=program,
+        columns=to_columns(program),
+        has_start_anchor=has_start_anchor,
+        has_end_anchor=has_end_anchor,
+        min_length=calculate_min_match_length(tokens),
+        uses_backrefs=uses_backrefs,
+        capture_slots=max(group_numbers, default=0) + 1,
+        prefix=calculate_literal_prefix(tokens),
+        required=calculate_required_literal(tokens),
+        start_search=build_start_search(tokens),
+        nfa=nfa,
+        nfa_masks=nfa_masks,
+        dfa=(
+            None
+            if nfa is None
+            else LazyDfa(nfa, nfa_masks, has_start_anchor, character_matches_token)
+        ),
+        fixed_matcher=generate_fixed_matcher(program, character_matches_token),
+    )
 
 
 def try_match(
-    tokens: list[dict],
+    program: tuple[list, list, list, list],
     input_line: str,
     has_end_anchor: bool,
-    token_index: int,
+    pc: int,
     j: int,
-    captures: dict[int, str],
+    captures: list[Optional[str]],
+    visited: Optional[bytearray] = None,
 ) -> bool:
     """
-    Matches a tokenized regex pattern against an input line.
-
-    Processes single tokens one at a time and handles grouping, quantifiers
-    and backreferences. Calls helper functions to test subpatterns and track
-    captured groups. True is only returned if the full token sequence is a
-    match and respects start/end anchors if specified.
+    Runs a compiled pattern program against an input line from position `j`.
+
+    Walks the program with an explicit backtracking stack instead of Python
+    recursion. Every choice point (alternation, optional tokens, greedy
+    quantifiers and group repetition) pushes a `(pc, j, undo_mark, lowest_j)`
+    entry; when a path fails, the most recent entry is popped and
+    matching resumes from it. Greedy `+` runs push a single entry that is
+    walked back one character at a time down to `lowest_j`.
+
+    Capture and group-start writes are recorded in an undo log, so restoring
+    state on backtrack only reverts the writes made since the choice point
+    instead of copying the captures. Captures and group starts are lists
+    indexed by group number, so each write is a single slot store. When
+    matching fails, every write is reverted and `captures` is left as it was
+    passed in.
+
+    Choice instructions are memoized: once one has been entered at a given
+    state, reaching it again can only repeat work that already failed, so it
+    is rejected. Code between choice instructions is linear, so this
+    bounds matching to O(len(program) * len(input_line)) steps. When `visited`
+    is given, states are keyed on `(pc, j)` in that flat bitmap, which is only
+    valid for programs without backreferences and can be shared between start
+    positions. Otherwise a local set keyed on `pc`, `j` and the contents of
+    the captures and group starts is used: paths that reach the same
+    instruction and position with the same captured text behave identically,
+    however they got there. A choice instruction is also abandoned when
+    fewer characters are left on the line than the rest of the program needs
+    (the fourth column, from `calculate_min_remaining()`).
 
     This function is the backbone of this regex engine. It models how it
     backtracks and evaluates nested patterns.
 
     Args:
-        tokens (list[dict]): Parsed regex tokens to evaluate.
+        program (tuple[list, list, list, list]): Compiled program split
+            into columns by `to_columns()`.
         input_line (str): The string to test against the pattern.
         has_end_anchor (bool): Whether the pattern has a line-end match.
-        token_index (int): Current index in the token list.
+        pc (int): Index of the instruction to start from.
         j (int): Current character position in the input string.
-        captures (dict[int, str]): Active capture groups and their matched text.
+        captures (list[Optional[str]]): Matched text of each capture group,
+            indexed by group number, with None for groups that have not
+            matched. Must have `capture_slots` entries (see
+            `CompiledPattern`).
+        visited (Optional[bytearray]): Bitmap of `len(program)` rows by
+            `len(input_line) + 1` columns marking explored states. Defaults
+            to None.
 
     Returns:
-        bool: True if the remaining tokens successfully match the input,
+        bool: True if the remaining program successfully matches the input,
         else False.
     """
-    if token_index == len(tokens):
-        if has_end_anchor:
-            return j == len(input_line)
-        return True
+    input_len = len(input_line)
+    width = input_len + 1
+    match_fn = character_matches_token
+    group_starts = [None] * len(captures)
+    stack = []
+    undo = []
+    # The bitmap replaces the state set whenever it is given.
+    seen = set() if visited is None else None
+
+    opcodes, args, args2, min_remaining = program
+
+    while True:
+        op = opcodes[pc]
+
+        if op == OP_CHAR:
+            if j < input_len:
+                code = ord(input_line[j])
+                if (
+                    args2[pc][code]
+                    if code < TABLE_SIZE
+                    else match_fn(input_line[j], args[pc])
+                ):
+                    pc += 1
+                    j += 1
+                    continue
+
+        elif op == OP_JMP:
+            pc = args[pc]
+            continue
+
+        elif op == OP_GROUP_START:
+            arg = args[pc]
+            undo.append((group_starts, arg, group_starts[arg]))
+            group_starts[arg] = j
+            pc += 1
+            continue
+
+        elif op == OP_GROUP_END:
+            arg = args[pc]
+            undo.append((captures, arg, captures[arg]))
+            captures[arg] = input_line[group_starts[arg] : j]
+            pc += 1
+            continue
+
+        elif op == OP_BACKREF:
+            captured_text = captures[args[pc]]
+            if (
+                captured_text is not None
+                and (captured_text or not args2[pc])
+                and input_line.startswith(captured_text, j)
+            ):
+                pc += 1
+                j += len(captured_text)
+                continue
 
-    token = tokens[token_index]
-    token_type = token["type"]
-    quantifier = token.get("quantifier")
-
-    if token_type == "group":
-        saved_captures = captures.copy()
-        group_start_position = j
-        alternatives = token["alternatives"]
-
-        if quantifier == "+":
-            group_start_position = j
-            matched_once = False
-
-            for alt_tokens in alternatives:
-                temporary_captures = saved_captures.copy()
-                success, new_j = try_match_sequence(
-                    alt_tokens, input_line, j, temporary_captures
-                )
-                if success:
-                    test_captures = saved_captures.copy()
-                    test_captures.update(temporary_captures)
-                    group_number = token.get("number")
-                    if group_number is not None:
-                        test_captures[group_number] = input_line[
-                            group_start_position:new_j
-                        ]
-
-                    matched_once = True
-                    if try_match(
-                        tokens,
-                        input_line,
-                        has_end_anchor,
-                        token_index + 1,
-                        new_j,
-                        test_captures,
-                    ):
-                        captures.clear()
-                        captures.update(test_captures)
-                        return True
-
-                    captures.clear()
-                    captures.update(saved_captures)
-
-            return matched_once and False
-
-        elif quantifier == "?":
-            group_start_position = j
-
-            for alt_tokens in alternatives:
-                temporary_captures = saved_captures.copy()
-                success, new_j = try_match_sequence(
-                    alt_tokens, input_line, j, temporary_captures
-                )
-                if success:
-                    test_captures = saved_captures.copy()
-                    test_captures.update(temporary_captures)
-                    group_number = token.get("number")
-                    if group_number is not None:
-                        test_captures[group_number] = input_line[
-                            group_start_position:new_j
-                        ]
-
-                    if try_match(
-                        tokens,
-                        input_line,
-                        has_end_anchor,
-                        token_index + 1,
-                        new_j,
-                        test_captures,
+        elif op == OP_MATCH:
+            if not has_end_anchor or j == input_len:
+                return True
+
+        else:
+            if visited is None:
+                state = (pc, j, *captures, *group_starts)
+                revisit = state in seen
+                seen.add(state)
+            else:
+                state = pc * width + j
+                revisit = visited[state]
+                visited[state] = 1
+
+            if revisit or input_len - j < min_remaining[pc]:
+                pass
+
+            elif op == OP_PLUS:
+                arg = args[pc]
+                count = count_greedy_matches(input_line, j, arg)
+                suffix = arg.get("suffix")
+                if count and suffix:
+                    # Jump to the last position where the literal run that
+                    # follows could start, instead of giving back one by one.
+                    count = input_line.rfind(suffix, j + 1, j + count + len(suffix)) - j
+                    count = max(count, 0)
+                if count:
+                    if count > 1 and not args2[pc]:
+                        stack.append((pc + 1, j + count - 1, len(undo), j + 1))
+                    pc += 1
+                    j += count
+                    continue
+
+            elif op == OP_OPT:
+                if j < input_len:
+                    code = ord(input_line[j])
+                    if (
+                        args2[pc][code]
+                        if code < TABLE_SIZE
+                        else match_fn(input_line[j], args[pc])
                     ):
-                        captures.clear()
-                        captures.update(test_captures)
-                        return True
+                        stack.append((pc + 1, j, len(undo), j))
+                        j += 1
+                pc += 1
+                continue
+
+            elif op == OP_BOUNDED:
+                count = min(count_greedy_matches(input_line, j, args[pc]), args2[pc])
+                pc += 1
+                if count:
+                    stack.append((pc, j + count - 1, len(undo), j))
+                    j += count
+                continue
+
+            elif op == OP_SPLIT:
+                stack.append((args2[pc], j, len(undo), j))
+                pc = args[pc]
+                continue
 
-                    captures.clear()
-                    captures.update(saved_captures)
+            else:
+                if j > group_starts[args2[pc]]:
+                    stack.append((pc + 1, j, len(undo), j))
+                    pc = args[pc]
+                else:
+                    pc += 1
+                continue
+
+        if not stack:
+            for target, key, old_value in reversed(undo):
+                target[key] = old_value
+            return False
 
-            if try_match(
-                tokens, input_line, has_end_anchor, token_index + 1, j, captures
-            ):
-                return True
+        pc, j, undo_mark, lowest_j = stack.pop()
+        if j > lowest_j:
+            stack.append((pc, j - 1, undo_mark, lowest_j))
+        # Reverted inline rather than in a helper, since this runs on every
+        # backtrack and a call would add a frame each time.
+        while len(undo) > undo_mark:
+            target, key, old_value = undo.pop()
+            target[key] = old_value
 
-            return False
 
+def match_pattern(input_line: str, pattern: str, ignore_case: bool = False) -> bool:
+    """
+    The main function for pattern matching. Determines if an input string (`input_line`)
+    matches a given regex pattern.
+
+    Pattern is compiled once through `compile_pattern()` and evaluated against
+    the input at every possible starting position while respecting anchors.
+    Calls `match_compiled()` for the actual matching. Can optionally ignore case.
+
+    Args:
+        input_line (str): The string to test against the pattern.
+        pattern (str): The regex pattern to match against.
+        ignore_case (bool, optional): If True, ignores case. Defaults to False.
+
+    Returns:
+        bool: True if pattern matches anywhere in the input line; else False.
+    """
+    if ignore_case:
+        input_line = input_line.lower()
+
+    return match_compiled(input_line, compile_pattern(pattern, ignore_case))
+
+
+def compile_patterns(
+    patterns: list[str], ignore_case: bool = False
+) -> list[CompiledPattern]:
+    """
+    Compiles a list of patterns once, before any lines are matched.
+
+    Callers searching many lines compile up front and pass the result to
+    `match_any()`, so the per-line work skips the cache lookup. Repeated
+    patterns are only kept once: the CLI passes the positional pattern both
+    on its own and in the pattern list, and a line that fails one copy would
+    otherwise be matched against the other as well.
+
+    Args:
+        patterns (list[str]): The regex patterns to compile.
+        ignore_case (bool, optional): If True, compiles the patterns for
+            use with `match_any(..., ignore_case=True)`. Defaults to False.
+
+    Returns:
+        list[CompiledPattern]: The compiled patterns, in the order each
+        first appears.
+    """
+    compiled_patterns = []
+    combinable = []
+    for pattern in dict.fromkeys(patterns):
+        compiled = compile_pattern(pattern, ignore_case)
+        if _can_combine(compiled):
+            combinable.append(pattern)
         else:
-            for alt_tokens in alternatives:
-                max_possible_len = len(input_line) - j
-                for max_len in range(max_possible_len, -1, -1):
-                    temporary_captures = saved_captures.copy()
-
-                    success, end_pos = try_match_sequence_with_limit(
-                        alt_tokens, input_line, j, max_len, temporary_captures
-                    )
-
-                    if success:
-                        test_captures = saved_captures.copy()
-                        test_captures.update(temporary_captures)
-                        group_number = token.get("number")
-                        if group_number is not None:
-                            test_captures[group_number] = input_line[
-                                group_start_position:end_pos
-                            ]
-
-                        if try_match(
-                            tokens,
-                            input_line,
-                            has_end_anchor,
-                            token_index + 1,
-                            end_pos,
-                            test_captures,
-                        ):
-                            captures.clear()
-                            captures.update(test_captures)
-                            return True
+            compiled_patterns.append(compiled)
 
-            return False
+    if len(combinable) > 1:
+        compiled_patterns.append(compile_pattern_set(tuple(combinable), ignore_case))
+    elif combinable:
+        compiled_patterns.append(compile_pattern(combinable[0], ignore_case))
+    return compiled_patterns
 
-    elif token_type == "backreference":
-        ref_number = token["number"]
 
-        if ref_number not in captures:
-            return False
+def _can_combine(compiled: CompiledPattern) -> bool:
+    """
+    Checks if a pattern is worth combining with others by `compile_patterns()`.
 
-        captured_text = captures[ref_number]
-        captured_len = len(captured_text)
+    Patterns with anchors or backreferences cannot be combined (see
+    `compile_pattern_set()`). Patterns with a literal prefix or a generated
+    `fixed_matcher` are left alone as well: `str.find()` already skips most
+    of a line for them, and the prefix also lets `search_file()` skip whole
+    files and lines that lack it.
 
-        if j + captured_len > len(input_line):
-            return False
+    Args:
+        compiled (CompiledPattern): A pattern from `compile_pattern()`.
 
-        if input_line[j : j + captured_len] != captured_text:
-            return False
+    Returns:
+        bool: True if the pattern should be matched as part of a set.
+    """
+    return not (
+        compiled.uses_backrefs
+        or compiled.has_start_anchor
+        or compiled.has_end_anchor
+        or compiled.prefix
+    )
 
-        return try_match(
-            tokens,
-            input_line,
-            has_end_anchor,
-            token_index + 1,
-            j + captured_len,
-            captures,
-        )
-
-    elif quantifier == "+":
-        max_count = count_greedy_matches(input_line, j, token)
-        if max_count == 0:
-            return False
-        for count in range(max_count, 0, -1):
+
+def match_any(
+    input_line: str, compiled_patterns: list[CompiledPattern], ignore_case: bool = False
+) -> bool:
+    """
+    Checks if any of several compiled patterns matches an input line.
+
+    Args:
+        input_line (str): The string to test against the patterns.
+        compiled_patterns (list[CompiledPattern]): Patterns from
+            `compile_patterns()`, tried in order.
+        ignore_case (bool, optional): If True, lowercases the line once
+            before matching. Must match the flag the patterns were compiled
+            with. Defaults to False.
+
+    Returns:
+        bool: True if at least one pattern matches the line; else False.
+    """
+    if ignore_case:
+        input_line = input_line.lower()
+
+    for compiled in compiled_patterns:
+        if match_compiled(input_line, compiled):
+            return True
+    return False
+
+
+def match_compiled(input_line: str, compiled: CompiledPattern) -> bool:
+    """
+    Matches an input line against a pattern from `compile_pattern()`.
+
+    Tries every possible starting position while respecting anchors, calling
+    `try_match()` for each. When the pattern starts with literal text, only
+    positions where `str.find()` locates that text are tried; when it starts
+    with another single-character token, candidates come from the pattern's
+    `start_search`. For patterns without backreferences a single
+    visited bitmap is shared by all start positions, since a state that failed
+    from one start fails from every other start as well. When that bitmap
+    would exceed `MAX_VISITED_STATES` entries, the line is handed to
+    `simulate_nfa()` instead.
+
+    Lines that lack the pattern's `required` literal are rejected with a
+    single substring test before any of this runs.
+
+    Patterns without backreferences are first matched with `scan_dfa()`; the
+    strategies above are only used when their DFA has run out of states.
+    Patterns with a generated `fixed_matcher` skip all of these and call it
+    at each candidate position.
+
+    Args:
+        input_line (str): The string to test against the pattern.
+        compiled (CompiledPattern): The compiled pattern.
+
+    Returns:
+        bool: True if pattern matches anywhere in the input line; else False.
+    """
+    required = compiled.required
+    if required and required not in input_line:
+        return False
+
+    if compiled.fixed_matcher is not None:
+        return _match_fixed(input_line, compiled)
+
+    if compiled.dfa is not None:
+        matched = scan_dfa(input_line, compiled)
+        if matched is not None:
+            return matched
+
+    program = compiled.program
+    if (
+        compiled.nfa is not None
+        and len(program) * (len(input_line) + 1) > MAX_VISITED_STATES
+    ):
+        return simulate_nfa(input_line, compiled)
+
+    columns = compiled.columns
+    has_end_anchor = compiled.has_end_anchor
+    prefix = compiled.prefix
+    # try_match() rewinds every capture it wrote when it fails, so one
+    # list serves all start positions.
+    captures = [None] * compiled.capture_slots
+    visited = None
+    if not compiled.uses_backrefs:
+        visited = bytearray(len(program) * (len(input_line) + 1))
+
+    if prefix:
+        # The prefix compiles to the first len(prefix) instructions, so each
+        # candidate found by str.find resumes the program right after it.
+        prefix_len = len(prefix)
+        if compiled.has_start_anchor:
+            last_start = 0
+        else:
+            last_start = len(input_line) - compiled.min_length
+        find = input_line.find
+        start_index = find(prefix, 0, last_start + prefix_len)
+        while start_index != -1:
             if try_match(
-                tokens, input_line, has_end_anchor, token_index + 1, j + count, captures
+                columns,
+                input_line,
+                has_end_anchor,
+                prefix_len,
+                start_index + prefix_len,
+                captures,
+                visited,
             ):
                 return True
+            start_index = find(prefix, start_index + 1, last_start + prefix_len)
+        return False
 
+    start_search = compiled.start_search
+    if start_search is not None and not compiled.has_start_anchor:
+        end = len(input_line) - compiled.min_length + 1
+        found = start_search(input_line, 0, end)
+        while found is not None:
+            start_index = found.start()
+            if try_match(
+                columns, input_line, has_end_anchor, 0, start_index, captures, visited
+            ):
+                return True
+            found = start_search(input_line, start_index + 1, end)
         return False
 
-    elif quantifier == "?":
-        single_match = (
-            j < len(input_line)
-            and character_matches_token(input_line[j], token)
-            and try_match(
-                tokens, input_line, has_end_anchor, token_index + 1, j + 1, captures
-            )
-        )
-        no_match = try_match(
-            tokens, input_line, has_end_anchor, token_index + 1, j, captures
-        )
-        return single_match or no_match
+    start_indices = calculate_start_indices(
+        len(input_line), compiled.min_length, compiled.has_start_anchor
+    )
 
-    else:
-        if j >= len(input_line):
-            return False
-        c = input_line[j]
-        if not character_matches_token(c, token):
-            return False
-        return try_match(
-            tokens, input_line, has_end_anchor, token_index + 1, j + 1, captures
-        )
+    for start_index in start_indices:
+        if try_match(
+            columns, input_line, has_end_anchor, 0, start_index, captures, visited
+        ):
+            return True
 
+    return False
 
-def try_match_sequence_with_limit(
-    tokens: list[dict],
-    input_line: str,
-    start_j: int,
-    max_len: int,
-    captures: dict[int, str],
-) -> tuple[bool, int]:
+
+def scan_dfa(input_line: str, compiled: CompiledPattern) -> Optional[bool]:
     """
-    Works similar to `try_match_sequence()`, but has a hard limit (`max_len`)
-    that prevents over-matching. Matches a sequence of regex tokens against a
-    substring of the input and stops when max_len is reached. Utilizes recursive
-    descent for evaluation of groups, backreferences and quantifiers.
+    Matches an input line with one DFA transition per character.
+
+    Walks the pattern's `LazyDfa`, building missing transitions as they are
+    first needed. Run time is O(line length) however the pattern is
+    written. When the DFA is in its dead state on an unanchored pattern, the
+    scan jumps straight to the next candidate start position.
 
     Args:
-        tokens (list[dict]): Parsed regex tokens to evaluate.
         input_line (str): The string to test against the pattern.
-        start_j (int): The starting index for matching.
-        max_len (int): The maximum allowed span to match within.
-        captures (dict[int, str]): Active capture groups and their matched text.
+        compiled (CompiledPattern): A compiled pattern whose `dfa` is set.
 
     Returns:
-        A tuple `(success, new_index)` where:
-            - `success`: True if token sequence matched within limits.
-            - `new_index`: Position in `input_line` after match.
-    """
-    j = start_j
-    first_captures = captures.copy()
-
-    for token in tokens:
-        if j > start_j + max_len:
-            captures.clear()
-            captures.update(first_captures)
-            return (False, start_j)
-
-        token_type = token["type"]
-        quantifier = token.get("quantifier")
-
-        if token_type == "group":
-            saved_captures = captures.copy()
-            group_start_position = j
-            alternatives = token["alternatives"]
-
-            remaining_len = max_len - (j - start_j)
-
-            if quantifier == "+":
-                matched = False
-                for alt_tokens in alternatives:
-                    temporary_captures = saved_captures.copy()
-                    success, new_j = try_match_sequence_with_limit(
-                        alt_tokens, input_line, j, remaining_len, temporary_captures
-                    )
-                    if success:
-                        captures.update(temporary_captures)
-                        group_number = token.get("number")
-                        if group_number is not None:
-                            captures[group_number] = input_line[
-                                group_start_position:new_j
-                            ]
-                        j = new_j
-                        matched = True
-                        break
-                if not matched:
-                    captures.clear()
-                    captures.update(first_captures)
-                    return (False, start_j)
-
-            elif quantifier == "?":
-                for alt_tokens in alternatives:
-                    temporary_captures = saved_captures.copy()
-                    success, new_j = try_match_sequence_with_limit(
-                        alt_tokens, input_line, j, remaining_len, temporary_captures
-                    )
-                    if success:
-                        captures.update(temporary_captures)
-                        group_number = token.get("number")
-                        if group_number is not None:
-                            captures[group_number] = input_line[
-                                group_start_position:new_j
-                            ]
-                        j = new_j
-                        break
-
-            else:
-                matched = False
-                for alt_tokens in alternatives:
-                    temporary_captures = saved_captures.copy()
-                    success, new_j = try_match_sequence_with_limit(
-                        alt_tokens, input_line, j, remaining_len, temporary_captures
-                    )
-                    if success:
-                        captures.update(temporary_captures)
-                        group_number = token.get("number")
-                        if group_number is not None:
-                            captures[group_number] = input_line[
-                                group_start_position:new_j
-                            ]
-                        j = new_j
-                        matched = True
-                        break
-                if not matched:
-                    captures.clear()
-                    captures.update(first_captures)
-                    return (False, start_j)
-
-        elif quantifier == "+":
-            remaining_len = max_len - (j - start_j)
-            max_count = count_greedy_matches(input_line, j, token)
-            max_count = min(max_count, remaining_len)
-            if max_count == 0:
-                return (False, start_j)
-            j += max_count
-
-        elif quantifier == "?":
-            if j < len(input_line) and character_matches_token(input_line[j], token):
-                j += 1
-
-        elif token_type == "backreference":
-            ref_number = token["number"]
-            if ref_number not in captures:
-                return (False, start_j)
-            captured_text = captures[ref_number]
-            captured_len = len(captured_text)
-            if j + captured_len > len(input_line):
-                return (False, start_j)
-            if input_line[j : j + captured_len] != captured_text:
-                return (False, start_j)
-            j += captured_len
+        Optional[bool]: True if pattern matches anywhere in the input line,
+        False if it does not, or None if the DFA ran out of states and the
+        line has to be matched another way.
+    """
+    dfa = compiled.dfa
+    rows = dfa.rows
+    wide_rows = dfa.wide_rows
+    dead = dfa.dead
+    start = dfa.start
+    has_start_anchor = compiled.has_start_anchor
+    has_end_anchor = compiled.has_end_anchor
+    input_len = len(input_line)
+
+    # An empty match satisfies `$` at the end of the line unless `^` pins it
+    # to the start.
+    if compiled.nfa[2] and (
+        not has_end_anchor or not has_start_anchor or input_len == 0
+    ):
+        return True
 
+    state = start
+    j = 0
+    while j < input_len:
+        if state == dead:
+            if has_start_anchor:
+                return False
+            j = _next_start_candidate(input_line, j, compiled)
+            if j == -1:
+                return False
+            state = start
+
+        char = input_line[j]
+        code = ord(char)
+        j += 1
+
+        if code < TABLE_SIZE:
+            entry = rows[state][code]
+            if entry < 0:
+                entry = dfa.transition(state, code)
         else:
-            if j >= len(input_line):
-                return (False, start_j)
-            if not character_matches_token(input_line[j], token):
-                return (False, start_j)
-            j += 1
+            entry = wide_rows[state].get(char)
+            if entry is None:
+                entry = dfa.transition_char(state, char)
+        if entry < 0:
+            return None
 
-    return (True, j)
+        if entry & 1 and (not has_end_anchor or j == input_len):
+            return True
+        state = entry >> 1
+
+    return False
 
 
-def try_match_sequence(
-    tokens: list[dict], input_line: str, start_j: int, captures: dict[int, str]
-) -> tuple[bool, int]:
+def simulate_nfa(input_line: str, compiled: CompiledPattern) -> bool:
     """
-    Matches a sequence of regex tokens against an input line
-    starting from a given index (`start_j`). Similar to `try_match()`,
-    but tracks how far the match extends and keeps captured groups for later
-    reference.
+    Matches an input line by simulating the pattern's NFA breadth-first.
 
-    Iterates through tokens recursively and evaluates grousp, quantifiers and
-    backreferences in sequence. Upon a failed match it restores previous capture
-    states to ensure backtracking.
+    The set of active NFA states is kept as an integer bitmask (see
+    `build_nfa_masks()`). For each character, the states that consume it are
+    found with one AND against that character's mask, and the next active set
+    is the OR of their target masks, so the run time is bounded by
+    O(states × line length) with O(states) memory. When no state is active on
+    an unanchored pattern the scan jumps straight to the next candidate start
+    position.
 
     Args:
-        tokens (list[dict]): Parsed regex tokens to evaluate.
         input_line (str): The string to test against the pattern.
-        start_j (int): The starting index for matching.
-        captures (dict[int, str]): Active capture groups and their matched text.
+        compiled (CompiledPattern): A compiled pattern whose `nfa` is set.
 
     Returns:
-        A tuple `(success, new_index)` where:
-            - `success`: True if token sequence matched within limits.
-            - `new_index`: Position in `input_line` after match.
-    """
-    j = start_j
-    first_captures = captures.copy()
-
-    for token in tokens:
-        token_type = token["type"]
-        quantifier = token.get("quantifier")
-
-        if token_type == "group":
-            saved_captures = captures.copy()
-            group_start_position = j
-            alternatives = token["alternatives"]
-
-            if quantifier == "+":
-                matched = False
-                for alt_tokens in alternatives:
-                    temporary_captures = saved_captures.copy()
-                    success, new_j = try_match_sequence(
-                        alt_tokens, input_line, j, temporary_captures
-                    )
-                    if success:
-                        captures.update(temporary_captures)
-
-                        group_number = token.get("number")
-                        if group_number is not None:
-                            captures[group_number] = input_line[
-                                group_start_position:new_j
-                            ]
-
-                        j = new_j
-                        matched = True
-                        break
-                if not matched:
-                    captures.clear()
-                    captures.update(first_captures)
-                    return (False, start_j)
-
-            elif quantifier == "?":
-                for alt_tokens in alternatives:
-                    temporary_captures = saved_captures.copy()
-                    success, new_j = try_match_sequence(
-                        alt_tokens, input_line, j, temporary_captures
-                    )
-                    if success:
-                        captures.update(temporary_captures)
-
-                        group_number = token.get("number")
-                        if group_number is not None:
-                            captures[group_number] = input_line[
-                                group_start_position:new_j
-                            ]
-                        j = new_j
-                        break
-
-            else:
-                matched = False
-                for alt_tokens in alternatives:
-                    temporary_captures = saved_captures.copy()
-                    success, new_j = try_match_sequence(
-                        alt_tokens, input_line, j, temporary_captures
-                    )
-                    if success:
-                        captures.update(temporary_captures)
-
-                        group_number = token.get("number")
-                        if group_number is not None:
-                            captures[group_number] = input_line[
-                                group_start_position:new_j
-                            ]
-                        j = new_j
-                        matched = True
-                        break
-                if not matched:
-                    captures.clear()
-                    captures.update(first_captures)
-                    return (False, start_j)
-
-        elif quantifier == "+":
-            max_count = count_greedy_matches(input_line, j, token)
-            if max_count == 0:
-                return (False, start_j)
-            j += max_count
-
-        elif quantifier == "?":
-            if j < len(input_line) and character_matches_token(input_line[j], token):
-                j += 1
-
-        elif token_type == "backreference":
-            ref_number = token["number"]
-
-            if ref_number not in captures:
-                return (False, start_j)
-
-            captured_text = captures[ref_number]
-            captured_len = len(captured_text)
-
-            if j + captured_len > len(input_line):
-                return (False, start_j)
-
-            if input_line[j : j + captured_len] != captured_text:
-                return (False, start_j)
-
-            j += captured_len
+        bool: True if pattern matches anywhere in the input line; else False.
+    """
+    states, _, start_accepts = compiled.nfa
+    char_masks, target_masks, accept_mask, start_mask = compiled.nfa_masks
+    has_start_anchor = compiled.has_start_anchor
+    has_end_anchor = compiled.has_end_anchor
+    input_len = len(input_line)
+    match_fn = character_matches_token
+
+    # An empty match satisfies `$` at the end of the line unless `^` pins it
+    # to the start.
+    if start_accepts and (not has_end_anchor or not has_start_anchor or input_len == 0):
+        return True
 
+    active = start_mask
+    j = 0
+    while j < input_len:
+        if not active:
+            if has_start_anchor:
+                return False
+            j = _next_start_candidate(input_line, j, compiled)
+            if j == -1:
+                return False
+            active = start_mask
+
+        char = input_line[j]
+        code = ord(char)
+        j += 1
+
+        if code < TABLE_SIZE:
+            consuming = active & char_masks[code]
         else:
-            if j >= len(input_line):
-                return (False, start_j)
-            if not character_matches_token(input_line[j], token):
-                return (False, start_j)
-            j += 1
+            consuming = 0
+            for state_id, state in enumerate(states):
+                if active >> state_id & 1 and match_fn(char, state[0]):
+                    consuming |= 1 << state_id
 
-    return (True, j)
+        if consuming & accept_mask and (not has_end_anchor or j == input_len):
+            return True
 
+        active = 0
+        while consuming:
+            lowest = consuming & -consuming
+            active |= target_masks[lowest.bit_length() - 1]
+            consuming ^= lowest
 
-def match_pattern(input_line: str, pattern: str, ignore_case: bool = False) -> bool:
+        if active and not has_start_anchor:
+            active |= start_mask
+
+    return False
+
+
+def _match_fixed(input_line: str, compiled: CompiledPattern) -> bool:
     """
-    The main function for pattern matching. Determines if an input string (`input_line`)
-    matches a given regex pattern.
+    Matches an input line with the pattern's generated `fixed_matcher`.
 
-    Pattern is parsed into tokens and evaluated against the input at every possible
-    starting position while respecting anchors. Calls `try_match()` for the actual
-    matching. Can optionally ignore case.
+    The pattern always matches exactly `min_length` characters, so the end
+    anchor leaves a single start position to check.
 
     Args:
         input_line (str): The string to test against the pattern.
-        pattern (str): The regex pattern to match against.
-        ignore_case (bool, optional): If True, ignores case. Defaults to False.
+        compiled (CompiledPattern): A compiled pattern whose `fixed_matcher`
+            is set.
 
     Returns:
         bool: True if pattern matches anywhere in the input line; else False.
     """
-    if ignore_case:
-        input_line = input_line.lower()
-        pattern = pattern.lower()
+    match_at = compiled.fixed_matcher
+    last_start = len(input_line) - compiled.min_length
+    if last_start < 0:
+        return False
 
-    tokens, has_start_anchor, has_end_anchor = parse_pattern(pattern)
-    min_length = calculate_min_match_length(tokens)
-    start_indices = calculate_start_indices(
-        len(input_line), min_length, has_start_anchor
-    )
+    if compiled.has_end_anchor:
+        if compiled.has_start_anchor and last_start != 0:
+            return False
+        return match_at(input_line, last_start)
+    if compiled.has_start_anchor:
+        return match_at(input_line, 0)
 
-    for start_index in start_indices:
-        captures = {}
-        if try_match(tokens, input_line, has_end_anchor, 0, start_index, captures):
+    start_index = _next_start_candidate(input_line, 0, compiled)
+    while 0 <= start_index <= last_start:
+        if match_at(input_line, start_index):
             return True
-
+        start_index = _next_start_candidate(input_line, start_index + 1, compiled)
     return False
 
 
+def _next_start_candidate(input_line: str, j: int, compiled: CompiledPattern) -> int:
+    """
+    Finds the first position from `j` where a match of the pattern could start.
+
+    Args:
+        input_line (str): The string to test against the pattern.
+        j (int): Position to search from.
+        compiled (CompiledPattern): The compiled pattern.
+
+    Returns:
+        int: The candidate position, or -1 if there is none.
+    """
+    if compiled.prefix:
+        return input_line.find(compiled.prefix, j)
+    if compiled.start_search is not None:
+        found = compiled.start_search(input_line, j)
+        return -1 if found is None else found.start()
+    return j
+
+
 def character_matches_token(char: str, token: dict) -> bool | None:
     """
     Checks if a single character matches a regex token.
 
     Handles literals, escaped sequences (e.g., `\\d`, `\\w`), character classes
     (incl. negated) and wildcards. Gathers all character-level matching logic
-    for the engine.
+    for the engine. Characters below `TABLE_SIZE` are answered from the token's
+    precomputed `table` when the parser attached one, and characters above it
+    from the token's `wide_test`.
 
     Args:
         char (str): The character from the input string.
@@ -541,6 +826,15 @@ def character_matches_token(char: str, token: dict) -> bool | None:
         bool | None: True if the character matches the token, False if it
         doesn't match, or None if token type is unrecognized.
     """
+    table = token.get("table")
+    if table is not None:
+        code = ord(char)
+        if code < TABLE_SIZE:
+            return table[code] == 1
+        wide_test = token.get("wide_test")
+        if wide_test is not None:
+            return wide_test(char)
+
     token_type = token["type"]
 
     if token_type == "literal":
@@ -556,60 +850,14 @@ def character_matches_token(char: str, token: dict) -> bool | None:
             return char == value[1]
 
     elif token_type == "char_class":
-        value = token["value"]
-        if value.startswith("[^"):
-            return char not in value[2:-1]
-        else:
-            return char in value[1:-1]
+        ranges, negated = parse_class(token["value"])
+        return any(low <= char <= high for low, high in ranges) != negated
 
     elif token_type == "wildcard":
         return True
     return None
 
 
-def calculate_min_match_length(tokens: list[dict]) -> int:
-    """
-    Count minimum number of characters required to match a sequence of tokens.
-
-    Recursively evaluates the tokens and accounts for quantifiers ('+', '?') and
-    grouped alternatives. The minimum length is utilized to determine valid starting
-    positions when scanning input, thereby skipping positions where a match is
-    impossible.
-
-    Args:
-        tokens (list[dict]): A list of parsed regex tokens representing the pattern.
-
-    Returns:
-        int: The minimum number of characters required to match the token sequence.
-    """
-    length = 0
-    for token in tokens:
-        token_type = token["type"]
-        quantifier = token.get("quantifier")
-
-        if token_type == "group":
-            alternatives = token["alternatives"]
-            min_alt_lengths = [calculate_min_match_length(alt) for alt in alternatives]
-            group_min = min(min_alt_lengths)
-
-            if quantifier == "?":
-                length += 0
-            elif quantifier == "+":
-                length += group_min
-            else:
-                length += group_min
-
-        else:
-            if quantifier == "?":
-                length += 0
-            elif quantifier == "+":
-                length += 1
-            else:
-                length += 1
-
-    return length
-
-
 def calculate_start_indices(
     input_length: int, min_length: int, has_start_anchor: bool
 ) -> list | range:
@@ -641,7 +889,9 @@ def count_greedy_matches(input_line: str, j: int, token: dict) -> int:
 
     Iterates through the input string starting at index `j` and increments a
     counter for characters that match the given token. Used for the greedy
-    behavior of the '+' quantifier in the pattern matching.
+    behavior of the '+' quantifier in the pattern matching. Tokens carrying a
+    `scanner` from the parser consume whole runs in a single call; only a
+    run that stops on a character beyond the lookup tables is re-checked.
 
     Args:
         input_line (str): The string to test against the pattern.
@@ -651,14 +901,31 @@ def count_greedy_matches(input_line: str, j: int, token: dict) -> int:
     Returns:
         int: The number of consecutive characters matching the token.
     """
-    max_count = 0
+    input_len = len(input_line)
     temp_j = j
+    scanner = token.get("scanner")
+
+    if scanner is not None:
+        match_fn = character_matches_token
+        # Scanners are exact except for `\\d` beyond the table, so only a run
+        # that stops on such a character is re-checked.
+        while True:
+            temp_j = scanner(input_line, temp_j).end()
+            if (
+                temp_j < input_len
+                and ord(input_line[temp_j]) >= TABLE_SIZE
+                and match_fn(input_line[temp_j], token)
+            ):
+                temp_j += 1
+            else:
+                break
+    elif token["type"] == "literal":
+        value = token["value"]
+        while temp_j < input_len and input_line[temp_j] == value:
+            temp_j += 1
+    else:
+        match_fn = character_matches_token
+        while temp_j < input_len and match_fn(input_line[temp_j], token):
+            temp_j += 1
 
-    while temp_j < len(input_line):
-        c = input_line[temp_j]
-        if not character_matches_token(c, token):
-            break
-        max_count += 1
-        temp_j += 1
-
-    return max_count
+    return temp_j - j
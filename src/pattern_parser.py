@@ -1,8 +1,20 @@
-from typing import Optional
+import re
+from typing import Callable, Optional
+
+TABLE_SIZE = 256
+
+_DIGIT_TABLE = bytes(chr(code).isdigit() for code in range(TABLE_SIZE))
+_WORD_TABLE = bytes(
+    chr(code).isalnum() or chr(code) == "_" for code in range(TABLE_SIZE)
+)
+_WILDCARD_TABLE = bytes([1]) * TABLE_SIZE
 
 
 def parse_pattern(
-    pattern: str, group_number: Optional[list[int]] = None
+    pattern: str,
+    group_number: Optional[list[int]] = None,
+    referenced_groups: Optional[set[int]] = None,
+    fold_case: bool = False,
 ) -> tuple[list[dict], bool, bool]:
     """
     Converts a pattern string into a list of tokens.
@@ -12,10 +24,37 @@ def parse_pattern(
     alternatives and backreferences. Detects anchors for start-of-line (^) and
     end-of-line ($) separately.
 
+    Every single-character token also gets a `table` entry: a
+    256-byte lookup table with a 1 at every code point below 256 that the
+    token accepts, so the matcher can test most characters with one index,
+    and a `wide_test` from `build_wide_test()` for the code points above.
+    Single-character tokens additionally get a `scanner` that consumes a run
+    of accepted characters in one call (see `build_scanner()`). A `+` token
+    directly before the end anchor, or followed by a single-character token
+    that accepts none of its characters, is marked `atomic`, since the
+    matcher never needs to backtrack into it. Group tokens record the
+    `min_length` of their shortest alternative. A `+` token followed by
+    unquantified literals records them as its `suffix`, so the matcher can
+    find where the run has to stop with `str.rfind()`. A group whose
+    alternatives are all single characters, such as `(a|b|c)`, is parsed as
+    the character class `[abc]` unless a backreference refers to it.
+
+    With `fold_case`, the tokens match the lowercased text of a line in
+    every case the pattern would match the line itself ignoring case:
+    literals are lowercased, and character classes also accept the
+    lowercase form of each of their members (see `fold_class_case()`).
+    The class is folded after it is parsed, so `[Z-a]` stays the range
+    from `Z` to `a` rather than becoming the reversed `[z-a]`.
+
     Args:
         pattern (str): The pattern to tokenize.
         group_number (Optional[list[int]]): A list used to assign unique numbers
             to capturing groups during recursion. Defaults to None.
+        referenced_groups (Optional[set[int]]): Group numbers used by
+            backreferences anywhere in the pattern. Found by
+            `find_referenced_groups()` when None.
+        fold_case (bool): If True, builds tokens for matching lowercased
+            lines. Defaults to False.
 
     Returns:
         tuple[list[dict], bool, bool]:
@@ -23,8 +62,11 @@ def parse_pattern(
             - A boolean indicating if pattern has a start-of-line anchor (^).
             - A boolean indicating if pattern has an end-of-line anchor ($).
     """
+    is_top_level = group_number is None
     if group_number is None:
         group_number = [0]
+    if referenced_groups is None:
+        referenced_groups = find_referenced_groups(pattern)
 
     i = 0
     tokens = []
@@ -37,16 +79,18 @@ def parse_pattern(
     if has_end_anchor:
         pattern = pattern[:-1]
 
-    while i < len(pattern):
+    pattern_len = len(pattern)
+
+    while i < pattern_len:
         char = pattern[i]
 
-        if char == "\\" and i + 1 < len(pattern):
+        if char == "\\" and i + 1 < pattern_len:
 
             if pattern[i + 1].isdigit():
                 digit_start = i + 1
                 digit_end = digit_start
 
-                while digit_end < len(pattern) and pattern[digit_end].isdigit():
+                while digit_end < pattern_len and pattern[digit_end].isdigit():
                     digit_end += 1
 
                 number_str = pattern[digit_start:digit_end]
@@ -55,17 +99,56 @@ def parse_pattern(
                 tokens.append({"type": "backreference", "number": backref_number})
                 i = digit_end
 
+            elif (
+                fold_case
+                and pattern[i + 1] not in ("d", "w")
+                and pattern[i + 1].lower() != pattern[i + 1]
+            ):
+                # An escaped letter is a literal; lowercasing the escape
+                # itself could turn e.g. `\W` into `\w`.
+                tokens.extend(map(_literal_token, pattern[i + 1].lower()))
+                i += 2
+
             else:
-                tokens.append({"type": "escape", "value": pattern[i : i + 2]})
+                value = pattern[i : i + 2]
+                table = build_table(value)
+                tokens.append(
+                    {
+                        "type": "escape",
+                        "value": value,
+                        "table": table,
+                        "wide_test": build_wide_test(value),
+                        "scanner": build_scanner(value),
+                    }
+                )
                 i += 2
 
         elif char == "[":
             end_index = pattern.find("]", i)
-            tokens.append({"type": "char_class", "value": pattern[i : end_index + 1]})
+            value = pattern[i : end_index + 1]
+            if fold_case:
+                value = fold_class_case(value)
+            table = build_table(value)
+            tokens.append(
+                {
+                    "type": "char_class",
+                    "value": value,
+                    "table": table,
+                    "wide_test": build_wide_test(value),
+                    "scanner": build_scanner(value),
+                }
+            )
             i = end_index + 1
 
         elif char == ".":
-            tokens.append({"type": "wildcard"})
+            tokens.append(
+                {
+                    "type": "wildcard",
+                    "table": _WILDCARD_TABLE,
+                    "wide_test": build_wide_test(None),
+                    "scanner": build_scanner(None),
+                }
+            )
             i += 1
 
         elif char == "(":
@@ -78,29 +161,144 @@ def parse_pattern(
 
             alternatives = []
             for alt_pattern in alt_patterns:
-                alt_tokens, _, _ = parse_pattern(alt_pattern, group_number)
+                alt_tokens, _, _ = parse_pattern(
+                    alt_pattern, group_number, referenced_groups, fold_case
+                )
                 alternatives.append(alt_tokens)
 
-            tokens.append(
-                {
-                    "type": "group",
-                    "alternatives": alternatives,
-                    "number": current_group_number,
-                }
-            )
+            char_class = None
+            if len(alternatives) > 1 and current_group_number not in referenced_groups:
+                char_class = merge_single_char_alternatives(alternatives)
+
+            if char_class is not None:
+                tokens.append(char_class)
+            else:
+                tokens.append(
+                    {
+                        "type": "group",
+                        "alternatives": alternatives,
+                        "number": current_group_number,
+                        "min_length": min(
+                            _sequence_min_length(alt_tokens)
+                            for alt_tokens in alternatives
+                        ),
+                    }
+                )
 
             i = end_index + 1
+        elif fold_case:
+            # A few characters lowercase to more than one, e.g. `İ`.
+            tokens.extend(map(_literal_token, char.lower()))
+            i += 1
         else:
-            tokens.append({"type": "literal", "value": char})
+            tokens.append(_literal_token(char))
             i += 1
 
-        if i < len(pattern) and pattern[i] in ("+", "?"):
+        if i < pattern_len and pattern[i] in ("+", "?"):
             tokens[-1]["quantifier"] = pattern[i]
             i += 1
 
+    for index, token in enumerate(tokens):
+        if token.get("quantifier") == "+" and token["type"] not in (
+            "group",
+            "backreference",
+        ):
+            suffix = []
+            for next_token in tokens[index + 1 :]:
+                if next_token["type"] != "literal" or "quantifier" in next_token:
+                    break
+                suffix.append(next_token["value"])
+            if suffix:
+                token["suffix"] = "".join(suffix)
+
+            # Giving back characters the next token cannot accept never helps.
+            if index + 1 < len(tokens) and tokens_are_disjoint(
+                token, tokens[index + 1]
+            ):
+                token["atomic"] = True
+
+    # A greedy token right before `$` can only succeed by consuming up to the
+    # end of the line, so giving characters back never helps.
+    if (
+        is_top_level
+        and has_end_anchor
+        and tokens
+        and tokens[-1].get("quantifier") == "+"
+        and tokens[-1]["type"] not in ("group", "backreference")
+    ):
+        tokens[-1]["atomic"] = True
+
     return tokens, has_start_anchor, has_end_anchor
 
 
+def _literal_token(char: str) -> dict:
+    """
+    Builds the token for a literal character.
+
+    Args:
+        char (str): The character.
+
+    Returns:
+        dict: A `literal` token with its lookup table, wide test and scanner.
+    """
+    return {
+        "type": "literal",
+        "value": char,
+        "table": build_table(char),
+        "wide_test": build_wide_test(char),
+        "scanner": build_scanner(char),
+    }
+
+
+def tokens_are_disjoint(token: dict, next_token: dict) -> bool:
+    """
+    Checks that no character is accepted by both of two tokens.
+
+    Only answers True for an unquantified or `+`-quantified single-character
+    `next_token`; an optional one could be skipped, letting a later token
+    decide. Characters beyond the lookup tables are compared conservatively:
+    two tokens that may both accept such characters are never disjoint.
+
+    Args:
+        token (dict): A single-character token.
+        next_token (dict): The token that follows it.
+
+    Returns:
+        bool: True if the two tokens accept no common character.
+    """
+    if "table" not in next_token or next_token.get("quantifier") == "?":
+        return False
+
+    if _accepts_beyond_table(token) and _accepts_beyond_table(next_token):
+        return False
+
+    table = token["table"]
+    next_table = next_token["table"]
+    return not any(table[code] and next_table[code] for code in range(TABLE_SIZE))
+
+
+def _accepts_beyond_table(token: dict) -> bool:
+    """
+    Checks if a single-character token may accept characters past the table.
+
+    Args:
+        token (dict): A single-character token.
+
+    Returns:
+        bool: True if the token accepts any code point of `TABLE_SIZE` or more.
+    """
+    token_type = token["type"]
+    if token_type == "wildcard":
+        return True
+
+    value = token["value"]
+    if value in ("\\d", "\\w"):
+        return True
+
+    ranges, negated = _value_ranges(value)
+    return negated or any(ord(high) >= TABLE_SIZE for _low, high in ranges)
+
+
 def find_matching_parentheses(pattern: str, start_index: int) -> int:
     """
     Finds the index of a closing parenthesis to match an opening parenthesis.
@@ -118,11 +316,13 @@ def find_matching_parentheses(pattern: str, start_index: int) -> int:
     """
     depth = 1
     i = start_index + 1
+    pattern_len = len(pattern)
 
-    while i < len(pattern):
-        if pattern[i] == "(":
+    while i < pattern_len:
+        char = pattern[i]
+        if char == "(":
             depth += 1
-        elif pattern[i] == ")":
+        elif char == ")":
             depth -= 1
             if depth == 0:
                 return i
@@ -146,21 +346,411 @@ def split_alternatives(pattern: str) -> list[str]:
         list[str]: A list of strings representing the separate alternatives.
     """
     alternatives = []
-    current_alternative = ""
+    alternative_start = 0
     depth = 0
 
-    for char in pattern:
+    for i, char in enumerate(pattern):
         if char == "(":
             depth += 1
-            current_alternative += char
         elif char == ")":
             depth -= 1
-            current_alternative += char
         elif char == "|" and depth == 0:
-            alternatives.append(current_alternative)
-            current_alternative = ""
-        else:
-            current_alternative += char
+            alternatives.append(pattern[alternative_start:i])
+            alternative_start = i + 1
 
-    alternatives.append(current_alternative)
+    alternatives.append(pattern[alternative_start:])
     return alternatives
+
+
+def find_referenced_groups(pattern: str) -> set[int]:
+    """
+    Collects the group numbers used by backreferences in a pattern.
+
+    Scans for a backslash followed by digits, skipping over other escape
+    sequences so that e.g. `\\\\1` is read as an escaped backslash and a
+    literal `1`.
+
+    Args:
+        pattern (str): The pattern to scan.
+
+    Returns:
+        set[int]: The numbers of all referenced groups.
+    """
+    referenced = set()
+    i = 0
+    pattern_len = len(pattern)
+
+    while i < pattern_len - 1:
+        if pattern[i] != "\\":
+            i += 1
+            continue
+
+        digit_end = i + 1
+        while digit_end < pattern_len and pattern[digit_end].isdigit():
+            digit_end += 1
+
+        if digit_end > i + 1:
+            referenced.add(int(pattern[i + 1 : digit_end]))
+            i = digit_end
+        else:
+            i += 2
+
+    return referenced
+
+
+def merge_single_char_alternatives(alternatives: list[list[dict]]) -> Optional[dict]:
+    """
+    Fuses alternatives that each match one fixed character into a class.
+
+    A group like `(a|b|\\.)` tries every alternative at each position; the
+    equivalent `[ab.]` is a single table lookup. Only unquantified literals,
+    escaped literals and non-negated character classes are merged, since
+    their union can be written as a class that `character_matches_token()`
+    also answers correctly for code points beyond the lookup table. Ranges
+    such as `[a-f]` are carried over as ranges.
+
+    Args:
+        alternatives (list[list[dict]]): Parsed tokens of each alternative.
+
+    Returns:
+        Optional[dict]: A `char_class` token accepting the union of the
+        alternatives, or None if any alternative is not a single plain
+        character token.
+    """
+    members = []
+    for alt_tokens in alternatives:
+        if len(alt_tokens) != 1 or "quantifier" in alt_tokens[0]:
+            return None
+
+        token = alt_tokens[0]
+        token_type = token["type"]
+        value = token["value"] if "value" in token else ""
+
+        if token_type not in ("literal", "escape", "char_class") or value in (
+            "\\d",
+            "\\w",
+        ):
+            return None
+        ranges, negated = _value_ranges(value)
+        if negated:
+            return None
+
+        for member in ranges:
+            if member not in members:
+                members.append(member)
+
+    # A single `-` can only stay literal at the end, and a leading `^` would
+    # read as negation, so keep it out of first place.
+    if ("-", "-") in members:
+        members.remove(("-", "-"))
+        members.append(("-", "-"))
+    if members and members[0][0] == "^":
+        members.append(members.pop(0))
+        if members[0][0] == "^":
+            return None
+
+    value = (
+        "["
+        + "".join(low if low == high else f"{low}-{high}" for low, high in members)
+        + "]"
+    )
+    table = build_table(value)
+    return {
+        "type": "char_class",
+        "value": value,
+        "table": table,
+        "wide_test": build_wide_test(value),
+        "scanner": build_scanner(value),
+    }
+
+
+def parse_class(value: str) -> tuple[tuple[tuple[str, str], ...], bool]:
+    """
+    Splits the text of a character class into inclusive character ranges.
+
+    A `-` between two members forms a range, so `[a-z_]` gives `("a", "z")`
+    and `("_", "_")`. A `-` at the start or end of the class is a literal.
+
+    Args:
+        value (str): The class text, e.g. `[a-f0-9]` or `[^-x]`.
+
+    Returns:
+        tuple[tuple[tuple[str, str], ...], bool]: The `(low, high)` ranges,
+        with single characters as `(char, char)`, and whether the class is
+        negated.
+
+    Raises:
+        ValueError: If a range ends below where it starts, as in `[z-a]`.
+    """
+    negated = value.startswith("[^")
+    body = value[2:-1] if negated else value[1:-1]
+    ranges = []
+    i = 0
+    body_len = len(body)
+
+    while i < body_len:
+        if i + 2 < body_len and body[i + 1] == "-":
+            low, high = body[i], body[i + 2]
+            if low > high:
+                raise ValueError(f"Invalid range {low}-{high} in {value}")
+            ranges.append((low, high))
+            i += 3
+        else:
+            ranges.append((body[i], body[i]))
+            i += 1
+
+    return tuple(ranges), negated
+
+
+def fold_class_case(value: str) -> str:
+    """
+    Rewrites a character class to match lowercased text ignoring case.
+
+    The line is lowercased before matching, so a class has to accept the
+    lowercase form of every member: `[A-Z]` becomes `[A-Za-z]`. A negated
+    class rejects those forms instead, so `[^A]` still rejects `a`. Members
+    whose lowercase form is more than one character are left as they are.
+
+    Args:
+        value (str): The class text, e.g. `[A-F0-9]`.
+
+    Returns:
+        str: The class text with the lowercase forms added, or `value`
+        itself if no member has a different lowercase form.
+    """
+    ranges, negated = parse_class(value)
+    lowered = set()
+    for low, high in ranges:
+        for code in range(ord(low), ord(high) + 1):
+            folded = chr(code).lower()
+            if len(folded) == 1 and folded != chr(code):
+                lowered.add(ord(folded))
+    if not lowered:
+        return value
+
+    members = []
+    codes = sorted(lowered)
+    start = codes[0]
+    for previous, code in zip(codes, codes[1:] + [-1]):
+        if code != previous + 1:
+            members.append((chr(start), chr(previous)))
+            start = code
+    members.extend(ranges)
+
+    # Written so that `parse_class()` reads the same members back: ranges
+    # first, since a single character before a range starting with `-`
+    # would join it, then single characters, with a `-` last.
+    spans = [member for member in members if member[0] != member[1]]
+    singles = [low for low, high in members if low == high and low != "-"]
+    body = "".join(f"{low}-{high}" for low, high in dict.fromkeys(spans))
+    body += "".join(dict.fromkeys(singles))
+    if ("-", "-") in members:
+        body += "-"
+    if not negated and body.startswith("^"):
+        # Only an original range can come first here, so `singles` starts
+        # with a lowercase letter that keeps the `^` from reading as negation.
+        body = singles[0] + body
+    return ("[^" if negated else "[") + body + "]"
+
+
+def _value_ranges(value: str) -> tuple[tuple[tuple[str, str], ...], bool]:
+    """
+    Gives the ranges accepted by a literal, escaped literal or class.
+
+    Args:
+        value (str): A literal character, an escaped literal such as `\\.`,
+            or the class text.
+
+    Returns:
+        tuple[tuple[tuple[str, str], ...], bool]: The ranges and whether they
+        are negated, as returned by `parse_class()`.
+    """
+    if len(value) == 1:
+        return ((value, value),), False
+    if value.startswith("\\"):
+        return ((value[1], value[1]),), False
+    return parse_class(value)
+
+
+def ranges_to_expression(ranges: tuple[tuple[str, str], ...]) -> str:
+    """
+    Writes character ranges as the inside of an `re` character class.
+
+    Args:
+        ranges (tuple[tuple[str, str], ...]): Ranges from `parse_class()`.
+
+    Returns:
+        str: The escaped class members, e.g. `a\\-z` for a literal `-`
+        between `a` and `z`, or `a-z` for the range.
+    """
+    return "".join(
+        re.escape(low) if low == high else f"{re.escape(low)}-{re.escape(high)}"
+        for low, high in ranges
+    )
+
+
+def build_table(value: str) -> bytes:
+    """
+    Builds the lookup table for a literal, escape sequence or character class.
+
+    The table has one byte per code point below `TABLE_SIZE`, set to 1 when
+    the token accepts that character. Characters outside the table range are
+    left to `character_matches_token()`.
+
+    Args:
+        value (str): A literal character, or the escape (e.g. `\\d`) or class
+            (e.g. `[^abc]`) text.
+
+    Returns:
+        bytes: A `TABLE_SIZE`-byte lookup table.
+    """
+    if value == "\\d":
+        return _DIGIT_TABLE
+    if value == "\\w":
+        return _WORD_TABLE
+
+    table = bytearray(TABLE_SIZE)
+    ranges, negated = _value_ranges(value)
+
+    for low, high in ranges:
+        for code in range(ord(low), min(ord(high), TABLE_SIZE - 1) + 1):
+            table[code] = 1
+
+    if negated:
+        table = bytearray(1 - flag for flag in table)
+
+    return bytes(table)
+
+
+def build_wide_test(value: Optional[str]) -> Callable[[str], bool]:
+    """
+    Builds the test for characters beyond a token's lookup table.
+
+    The token's text is decided once here, so testing a character above
+    `TABLE_SIZE` is a single call instead of a dispatch on the token type.
+
+    Args:
+        value (Optional[str]): A literal character, or the escape (e.g. `\\d`)
+            or class (e.g. `[^abc]`) text. None for the wildcard.
+
+    Returns:
+        Callable[[str], bool]: Returns True for the characters the token
+        accepts.
+    """
+    if value is None:
+        return _accept_any
+    if value == "\\d":
+        return str.isdigit
+    if value == "\\w":
+        return _is_word_char
+    if len(value) == 1:
+        return value.__eq__
+    if value.startswith("\\"):
+        return value[1].__eq__
+
+    ranges, negated = parse_class(value)
+    singles = frozenset(low for low, high in ranges if low == high)
+    spans = tuple((low, high) for low, high in ranges if low != high)
+    if spans:
+
+        def contains(char: str) -> bool:
+            return char in singles or any(low <= char <= high for low, high in spans)
+
+    else:
+        contains = singles.__contains__
+
+    if negated:
+        return lambda char: not contains(char)
+    return contains
+
+
+def _accept_any(_char: str) -> bool:
+    """
+    Accepts every character; the wide test of the wildcard.
+
+    Args:
+        _char (str): The character to test.
+
+    Returns:
+        bool: Always True.
+    """
+    return True
+
+
+def _is_word_char(char: str) -> bool:
+    """
+    Checks if a character is matched by `\\w`.
+
+    Args:
+        char (str): The character to test.
+
+    Returns:
+        bool: True for letters, digits and the underscore.
+    """
+    return char.isalnum() or char == "_"
+
+
+def build_scanner(value: Optional[str]) -> Optional[Callable]:
+    """
+    Builds a compiled scanner that consumes a run of accepted characters.
+
+    The scanner is the `match` method of a `re` pattern of the form `[...]*`,
+    so `scanner(line, j).end()` skips every accepted character from `j` in a
+    single call into the C regex engine. The pattern is written from the
+    token's text, so it accepts exactly the characters the token does, at
+    any code point. The one exception is `\\d`: `str.isdigit()` accepts a
+    few more characters than `re`'s `\\d`, such as other superscript digits,
+    so callers re-check a run that stops on a character beyond the table.
+
+    Args:
+        value (Optional[str]): A literal character, or the escape (e.g. `\\d`)
+            or class (e.g. `[^abc]`) text. None for the wildcard.
+
+    Returns:
+        Optional[Callable]: The scanner, or None if the token accepts no
+        character.
+    """
+    if value is None:
+        expression = "."
+    elif value == "\\w":
+        expression = "\\w"
+    elif value == "\\d":
+        # str.isdigit() also accepts the superscripts ², ³ and ¹.
+        expression = "[\\d\u00b2\u00b3\u00b9]"
+    else:
+        ranges, negated = _value_ranges(value)
+        escaped = ranges_to_expression(ranges)
+        if negated:
+            expression = f"[^{escaped}]" if escaped else "."
+        elif escaped:
+            expression = f"[{escaped}]"
+        else:
+            return None
+
+    return re.compile(expression + "*", re.DOTALL).match
+
+
+def _sequence_min_length(tokens: list[dict]) -> int:
+    """
+    Counts the minimum number of characters a token sequence can match.
+
+    Nested groups are parsed before the group that contains them, so their
+    `min_length` is already set and no recursion is needed. Backreferences
+    count as zero characters, since the group they repeat may have
+    captured empty text.
+
+    Args:
+        tokens (list[dict]): Parsed tokens of one alternative.
+
+    Returns:
+        int: The minimum match length of the sequence.
+    """
+    length = 0
+    for token in tokens:
+        if token.get("quantifier") == "?" or token["type"] == "backreference":
+            continue
+        if token["type"] == "group":
+            length += token["min_length"]
+        else:
+            length += 1
+    return length
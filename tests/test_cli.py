@@ -27,6 +27,17 @@ class TestParseArguments:
         assert args.pattern == "test"
         assert args.files == ["dir/"]
 
+    def test_parse_repeated_exclude_dir(self, monkeypatch):
+        """Test that each --exclude-dir glob is collected"""
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["pygrep", "-r", "--exclude-dir", ".git", "--exclude-dir=build*", "x", "."],
+        )
+        args = parse_arguments()
+        assert args.exclude_dirs == [".git", "build*"]
+        assert args.files == ["."]
+
     def test_parse_multiple_files(self, monkeypatch):
         """Test multiple file parsing"""
         monkeypatch.setattr(
@@ -167,3 +178,10 @@ class TestFlagValidation:
         with pytest.raises(SystemExit) as exc_info:
             parse_arguments()
         assert exc_info.value.code == EXIT_ERROR
+
+    def test_negative_jobs_rejected(self, monkeypatch):
+        """Test that a negative --jobs value causes an error."""
+        monkeypatch.setattr(sys, "argv", ["pygrep", "-j", "-1", "pattern"])
+        with pytest.raises(SystemExit) as exc_info:
+            parse_arguments()
+        assert exc_info.value.code == EXIT_ERROR
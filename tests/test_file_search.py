@@ -1,3 +1,5 @@
+import os
+from src import file_search
 from src.file_search import (
     search_file,
     search_multiple_files,
@@ -63,6 +65,74 @@ class TestFileSearch:
         out = capsys.readouterr().out
         assert f"{f2}:bar" in out
 
+    def test_get_files_recursively_skips_binary_files(self, tmp_path):
+        """Check that files with NUL bytes are left out of recursive searches."""
+        text = tmp_path / "notes.txt"
+        binary = tmp_path / "image.bin"
+        text.write_text("caf\u00e9 match\n", encoding="utf-8")
+        binary.write_bytes(b"\x89PNG\x00\x01 match\n")
+
+        assert get_files_recursively(str(tmp_path)) == [str(text)]
+        assert search_directory_recursively(str(tmp_path), "match") is True
+
+    def test_get_files_recursively_walks_in_listing_order(self, tmp_path):
+        """Check that nested files are found and symlinked dirs not followed."""
+        outer = tmp_path / "outer"
+        inner = outer / "inner"
+        inner.mkdir(parents=True)
+        (outer / "a.txt").write_text("a")
+        (inner / "b.txt").write_text("b")
+        (tmp_path / "link").symlink_to(outer, target_is_directory=True)
+
+        expected = []
+        for root, _dirs, files in os.walk(str(tmp_path)):
+            expected.extend(os.path.join(root, name) for name in files)
+
+        files = get_files_recursively(str(tmp_path))
+        assert files == expected
+        assert sorted(files) == [str(outer / "a.txt"), str(inner / "b.txt")]
+
+    def test_get_files_recursively_skips_special_files(self, tmp_path):
+        """Check that FIFOs and broken links are not collected as files."""
+        text = tmp_path / "notes.txt"
+        text.write_text("match\n")
+        os.mkfifo(tmp_path / "pipe")
+        (tmp_path / "dangling").symlink_to(tmp_path / "missing.txt")
+
+        assert get_files_recursively(str(tmp_path)) == [str(text)]
+
+    def test_get_files_recursively_prunes_excluded_dirs(self, tmp_path):
+        """Check that directories matching an exclude glob are not entered."""
+        (tmp_path / "keep").mkdir()
+        (tmp_path / "keep" / "a.txt").write_text("a")
+        for name in (".git", "build-x"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "b.txt").write_text("b")
+
+        files = get_files_recursively(str(tmp_path), [".git", "build*"])
+        assert files == [str(tmp_path / "keep" / "a.txt")]
+
+    def test_quiet_recursive_search_stops_walking(self, tmp_path, monkeypatch):
+        """Verify quiet mode stops taking files once the first one matches."""
+        first = tmp_path / "first.txt"
+        first.write_text("match\n")
+        sub = tmp_path / "sub"
+        sub.mkdir()
+        for name in ("a.txt", "b.txt"):
+            (sub / name).write_text("match\n")
+
+        walked = []
+        walk = file_search.iter_files_recursively
+
+        def record(directory, exclude_dirs=None):
+            for path in walk(directory, exclude_dirs):
+                walked.append(path)
+                yield path
+
+        monkeypatch.setattr(file_search, "iter_files_recursively", record)
+        assert search_directory_recursively(str(tmp_path), "match", quiet=True)
+        assert walked == [str(first)]
+
     def test_get_files_recursively_errors(self, tmp_path, capsys):
         """Verify error handling for invalid paths in get_files_recursively."""
         not_there = tmp_path / "nope"
@@ -525,3 +595,91 @@ class TestFilesOnlyModes:
         assert "line1" not in out
         assert "line3" not in out
         assert "line4" not in out
+
+
+class TestLiteralPrefilter:
+    """Tests skipping files that cannot contain the pattern's literal text."""
+
+    def test_file_without_prefix_is_not_decoded(self, tmp_path, capsys):
+        """Verify a file lacking the prefix is skipped before UTF-8 decoding."""
+        p = tmp_path / "data.bin"
+        p.write_bytes(b"\xff\xfe no match here\n")
+        assert search_file(str(p), "needle") is False
+        assert capsys.readouterr().err == ""
+
+    def test_file_without_inner_literal_is_not_decoded(self, tmp_path, capsys):
+        """Verify a literal after the start of the pattern also rules a file out."""
+        p = tmp_path / "data.bin"
+        p.write_bytes(b"\xff\xfe 42 errors\n")
+        assert search_file(str(p), "\\d+ failed") is False
+        assert capsys.readouterr().err == ""
+
+    def test_literal_match_lists_file_without_decoding(self, tmp_path, capsys):
+        """Check that -l settles a plain literal pattern from the raw bytes."""
+        p = tmp_path / "data.bin"
+        p.write_bytes(b"\xff\xfe a needle\n")
+        assert search_file(str(p), "needle", files_with_matches=True) is True
+        assert search_file(str(p), "need(le)?", files_without_match=True) is False
+        captured = capsys.readouterr()
+        assert captured.out == f"{p}\n"
+        assert captured.err == ""
+
+    def test_skipped_file_still_counted_and_listed(self, tmp_path, capsys):
+        """Check that -c and -L report a skipped file like any file without matches."""
+        p = tmp_path / "data.txt"
+        p.write_text("alpha\nbeta\n")
+        search_file(str(p), "gamma", count_only=True)
+        assert capsys.readouterr().out == "0\n"
+        assert search_file(str(p), "gamma", files_without_match=True) is True
+        assert capsys.readouterr().out == f"{p}\n"
+
+    def test_invert_match_and_empty_file_are_searched(self, tmp_path, capsys):
+        """Confirm invert matching and unmappable empty files still work."""
+        p = tmp_path / "data.txt"
+        p.write_text("alpha\nbeta\n")
+        assert search_file(str(p), "gamma", invert_match=True) is True
+        assert capsys.readouterr().out == "alpha\nbeta\n"
+
+        empty = tmp_path / "empty.txt"
+        empty.write_text("")
+        assert search_file(str(empty), "gamma") is False
+
+    def test_sparse_prefix_lines_keep_their_numbers(self, tmp_path, capsys):
+        """Verify lines found by jumping between prefixes report the right numbers."""
+        p = tmp_path / "data.txt"
+        lines = [f"line {i}" for i in range(1, 200)]
+        lines[41] = "a needle here"
+        lines[150] = "needle again"
+        p.write_text("\n".join(lines))
+        assert search_file(str(p), "needle", print_line_number=True) is True
+        assert capsys.readouterr().out == "42:a needle here\n151:needle again\n"
+
+    def test_lines_split_across_read_blocks(self, tmp_path, capsys, monkeypatch):
+        """Check that lines spanning several read blocks are matched whole."""
+        monkeypatch.setattr(file_search, "READ_BLOCK_CHARS", 4)
+        p = tmp_path / "data.txt"
+        p.write_text("short\nmuch longer needle line\nno\nlast needle")
+        assert search_file(str(p), "needle", print_line_number=True) is True
+        assert capsys.readouterr().out == ("2:much longer needle line\n4:last needle\n")
+
+    def test_sparse_prefix_skip_ignores_case(self, tmp_path, capsys):
+        """Check that -i finds prefixes in any case and prints lines unchanged."""
+        p = tmp_path / "data.txt"
+        lines = [f"line {i}" for i in range(1, 100)]
+        lines[9] = "A NEEDLE here"
+        lines[60] = "café Needle"
+        p.write_text("\n".join(lines), encoding="utf-8")
+        assert search_file(str(p), "needle", print_line_number=True, ignore_case=True)
+        assert capsys.readouterr().out == "10:A NEEDLE here\n61:café Needle\n"
+
+    def test_rejected_readahead_hint_still_reads(self, tmp_path, capsys, monkeypatch):
+        """Check that a file refusing posix_fadvise is searched normally."""
+        p = tmp_path / "data.txt"
+        p.write_text("one\ntwo needle\n")
+
+        def refuse(*_args):
+            raise OSError("not supported")
+
+        monkeypatch.setattr(os, "posix_fadvise", refuse, raising=False)
+        assert search_file(str(p), "[n]eedle") is True
+        assert capsys.readouterr().out == "two needle\n"
@@ -85,16 +85,37 @@ class TestMainCLI:
         code = self.run_main(["prog", "-r", "pattern", str(test_dir)], stdin_data="")
         assert code == EXIT_NO_MATCH
 
+    def test_invalid_pattern_on_files(self, tmp_path, capsys):
+        """Check an invalid pattern is reported for file and recursive searches."""
+        f = tmp_path / "data.txt"
+        f.write_text("x_y\n")
+        for argv in (
+            ["prog", "-E", "[z-a]", str(f)],
+            ["prog", "-E", "[z-a]", str(f), str(f)],
+            ["prog", "-r", "-E", "[z-a]", str(tmp_path)],
+            ["prog", "--json", "-E", "[z-a]", str(f)],
+        ):
+            assert self.run_main(argv) == EXIT_ERROR
+            assert "Invalid pattern" in capsys.readouterr().err
+
+    def test_ignore_case_class_ranges(self, tmp_path):
+        """Verify -i keeps class ranges that span both cases valid."""
+        f = tmp_path / "data.txt"
+        f.write_text("_\n")
+        assert self.run_main(["prog", "-i", "-E", "[Z-a]", str(f)]) == EXIT_MATCH_FOUND
+        assert self.run_main(["prog", "-i", "-E", "[A-z]", str(f)]) == EXIT_MATCH_FOUND
+        assert self.run_main(["prog", "-E", "[A-Z]", str(f)]) == EXIT_NO_MATCH
+
     def test_unexpected_error_caught(self, monkeypatch):
         """
-        Check that unexpected errors in match_pattern are caught
+        Check that unexpected errors in match_any are caught
         and return error exit code.
         """
 
         def boom(*args, **kwargs):
             raise ValueError("boom")
 
-        monkeypatch.setattr(mainmod, "match_pattern", boom)
+        monkeypatch.setattr(mainmod, "match_any", boom)
 
         code = self.run_main(["prog", "-E", "x"], stdin_data="abc")
         assert code == EXIT_ERROR
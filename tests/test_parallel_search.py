@@ -0,0 +1,83 @@
+from src import parallel_search
+from src.file_search import search_file
+from src.parallel_search import iter_file_results, iter_line_matches, resolve_jobs
+
+
+class TestResolveJobs:
+    """Tests conversion of the --jobs option into a process count."""
+
+    def test_zero_uses_cpu_count(self, monkeypatch):
+        """Check that 0 means one job per CPU."""
+        monkeypatch.setattr(parallel_search.os, "cpu_count", lambda: 6)
+        assert resolve_jobs(0) == 6
+        assert resolve_jobs(3) == 3
+
+    def test_below_one_runs_in_process(self):
+        """Check that counts below one fall back to a single job."""
+        assert resolve_jobs(1) == 1
+        assert resolve_jobs(-2) == 1
+
+
+class TestIterLineMatches:
+    """Tests ordered line matching, in-process and in worker processes."""
+
+    LINES = [f"line {n}" + (" error" if n % 7 == 0 else "") for n in range(50)]
+
+    def expected(self):
+        """Return the expected results for LINES and the 'err(or)?' pattern."""
+        return [(line, line.endswith("error")) for line in self.LINES]
+
+    def test_single_job_matches_in_order(self):
+        """Verify in-process matching with any of several patterns."""
+        results = list(iter_line_matches(self.LINES, ["zzz", "err(or)?"], False))
+        assert results == self.expected()
+
+    def test_worker_processes_preserve_order(self, monkeypatch):
+        """Check that batches sent to workers come back in input order."""
+        monkeypatch.setattr(parallel_search, "PARALLEL_BATCH_LINES", 20)
+        monkeypatch.setattr(parallel_search, "PARALLEL_MIN_LINES", 5)
+        results = list(iter_line_matches(self.LINES, ["ERR(OR)?"], True, jobs=2))
+        assert results == self.expected()
+
+
+class TestIterFileResults:
+    """Tests ordered file searches, in-process and in worker processes."""
+
+    def make_files(self, tmp_path):
+        """Create files where every third one contains a match."""
+        filenames = []
+        for n in range(6):
+            path = tmp_path / f"file{n}.txt"
+            path.write_text(f"head {n}\n" + ("needle\n" if n % 3 == 0 else ""))
+            filenames.append(str(path))
+        return filenames
+
+    def test_worker_output_matches_serial_search(self, tmp_path, capsys):
+        """Check that worker results and output come back in file order."""
+        filenames = self.make_files(tmp_path)
+        search_args = {"pattern": "needle", "print_filename": True}
+
+        serial = list(iter_file_results(search_file, filenames, search_args))
+        serial_output = capsys.readouterr().out
+        parallel = list(iter_file_results(search_file, filenames, search_args, jobs=2))
+
+        assert parallel == serial == [True, False, False, True, False, False]
+        assert capsys.readouterr().out == serial_output
+        assert serial_output == (f"{filenames[0]}:needle\n{filenames[3]}:needle\n")
+
+    def test_worker_pool_takes_names_as_results_are_used(self, tmp_path, monkeypatch):
+        """Verify names are not all taken before the first result is used."""
+        monkeypatch.setattr(parallel_search, "PARALLEL_FILES_PER_JOB", 1)
+        filenames = self.make_files(tmp_path)
+        taken = []
+
+        def walk():
+            for filename in filenames:
+                taken.append(filename)
+                yield filename
+
+        search_args = {"pattern": "needle", "quiet": True}
+        results = iter_file_results(search_file, walk(), search_args, jobs=2)
+        assert next(results) is True
+        results.close()
+        assert taken == filenames[:3]
@@ -0,0 +1,197 @@
+import pytest
+from src.pattern_compiler import (
+    compile_tokens,
+    to_columns,
+    calculate_min_remaining,
+    generate_fixed_matcher,
+    build_nfa,
+    build_nfa_masks,
+    LazyDfa,
+)
+from src.pattern_matcher import character_matches_token
+from src.pattern_parser import parse_pattern
+from src.constants import (
+    OP_CHAR,
+    OP_PLUS,
+    OP_OPT,
+    OP_SPLIT,
+    OP_JMP,
+    OP_GROUP_START,
+    OP_GROUP_END,
+    OP_REPEAT,
+    OP_BACKREF,
+    OP_MATCH,
+    OP_BOUNDED,
+)
+
+
+class TestCompileTokens:
+    """Tests lowering of parsed tokens into a flat matcher program."""
+
+    def test_compiles_single_character_tokens(self):
+        """Check that literals and quantified tokens map to their opcodes."""
+        tokens, _, _ = parse_pattern("ab+c?")
+        program = compile_tokens(tokens)
+        assert [instr[0] for instr in program] == [
+            OP_CHAR,
+            OP_PLUS,
+            OP_OPT,
+            OP_MATCH,
+        ]
+        assert program[0][1] is tokens[0]
+        assert program[1][2] is False
+
+    def test_marks_trailing_plus_before_end_anchor_atomic(self):
+        """Check that only a top-level `+` right before `$` is atomic."""
+        tokens, _, _ = parse_pattern("a\\w+$")
+        assert compile_tokens(tokens)[1] == (OP_PLUS, tokens[1], True)
+        tokens, _, _ = parse_pattern("a+a$")
+        assert compile_tokens(tokens)[0][2] is False
+
+    def test_collapses_runs_of_identical_optional_tokens(self):
+        """Check that `a?a?a?` becomes one bounded instruction."""
+        tokens, _, _ = parse_pattern("a?a?a?b?")
+        program = compile_tokens(tokens)
+        assert program[0] == (OP_BOUNDED, tokens[0], 3)
+        assert program[1][0] == OP_OPT and program[1][1] is tokens[3]
+
+    def test_compiles_group_alternation(self):
+        """Verify alternatives are joined by split and jump instructions."""
+        tokens, _, _ = parse_pattern("(a|\\d)")
+        program = compile_tokens(tokens)
+        first, second = (alt[0] for alt in tokens[0]["alternatives"])
+        assert program == [
+            (OP_GROUP_START, 1, None),
+            (OP_SPLIT, 2, 4),
+            (OP_CHAR, first, first["table"]),
+            (OP_JMP, 5, None),
+            (OP_CHAR, second, second["table"]),
+            (OP_GROUP_END, 1, None),
+            (OP_MATCH, None, None),
+        ]
+
+    def test_shares_common_prefixes_of_alternatives(self):
+        """Check that alternatives starting alike test their shared token once."""
+        tokens, _, _ = parse_pattern("(ab|x|ac)")
+        program = compile_tokens(tokens)
+        a, b = tokens[0]["alternatives"][0]
+        x = tokens[0]["alternatives"][1][0]
+        c = tokens[0]["alternatives"][2][1]
+        assert program == [
+            (OP_GROUP_START, 1, None),
+            (OP_SPLIT, 2, 8),
+            (OP_CHAR, a, a["table"]),
+            (OP_SPLIT, 4, 6),
+            (OP_CHAR, b, b["table"]),
+            (OP_JMP, 7, None),
+            (OP_CHAR, c, c["table"]),
+            (OP_JMP, 9, None),
+            (OP_CHAR, x, x["table"]),
+            (OP_GROUP_END, 1, None),
+            (OP_MATCH, None, None),
+        ]
+
+    def test_compiles_quantified_groups_and_backreferences(self):
+        """Check repetition and optional groups, and backreference opcodes."""
+        tokens, _, _ = parse_pattern("(a)+(b)?\\1")
+        program = compile_tokens(tokens)
+        assert program[3] == (OP_REPEAT, 0, 1)
+        assert program[4] == (OP_SPLIT, 5, 8)
+        assert program[8] == (OP_BACKREF, 1, False)
+
+    def test_splits_program_into_columns(self):
+        """Check that columns line up with the instructions they came from."""
+        tokens, _, _ = parse_pattern("(a|b)+")
+        program = compile_tokens(tokens)
+        opcodes, args, args2, min_remaining = to_columns(program)
+        assert list(zip(opcodes, args, args2)) == program
+        assert min_remaining == calculate_min_remaining(program)
+
+    def test_calculates_min_remaining_lengths(self):
+        """Check the characters each instruction needs to reach the match."""
+        tokens, _, _ = parse_pattern("a(bc|d)+e?f")
+        program = compile_tokens(tokens)
+        assert calculate_min_remaining(program) == [3, 2, 2, 3, 2, 1, 2, 1, 1, 1, 1, 0]
+        tokens, _, _ = parse_pattern("(a)\\1+x")
+        assert calculate_min_remaining(compile_tokens(tokens))[0] == 2
+
+
+class TestGenerateFixedMatcher:
+    """Tests code generation for patterns of plain single characters."""
+
+    def test_generates_matcher_for_plain_characters(self):
+        """Check the generated function on matching and failing positions."""
+        tokens, _, _ = parse_pattern("a\\d[^x].")
+        match_at = generate_fixed_matcher(
+            compile_tokens(tokens), character_matches_token
+        )
+        assert match_at("a1bc", 0)
+        assert match_at("za1ğc", 1)
+        assert not match_at("a1xc", 0)
+
+    def test_skips_programs_with_choice_points(self):
+        """Verify that quantifiers and groups are left to the backtracker."""
+        for pattern in ("ab+", "a(b)", "a?b"):
+            tokens, _, _ = parse_pattern(pattern)
+            program = compile_tokens(tokens)
+            assert generate_fixed_matcher(program, character_matches_token) is None
+
+
+class TestBuildNfa:
+    """Tests construction of the NFA used for the breadth-first simulation."""
+
+    def test_builds_states_for_consuming_instructions(self):
+        """Check states, targets and acceptance for a small pattern."""
+        tokens, _, _ = parse_pattern("a+(b|\\d)?")
+        states, start_states, start_accepts = build_nfa(compile_tokens(tokens))
+        assert len(states) == 3
+        assert start_states == (0,) and not start_accepts
+        assert set(states[0][2]) == {0, 1, 2} and states[0][3]
+        assert states[1][2] == () and states[1][3]
+
+    def test_encodes_states_as_bitmasks(self):
+        """Check the per-character, target, accept and start masks."""
+        tokens, _, _ = parse_pattern("a+(b|\\d)?")
+        states, start_states, _ = build_nfa(compile_tokens(tokens))
+        char_masks, target_masks, accept_mask, start_mask = build_nfa_masks(
+            states, start_states
+        )
+        assert char_masks[ord("a")] == 0b001
+        assert char_masks[ord("5")] == 0b100
+        assert target_masks[0] == 0b111
+        assert accept_mask == 0b111 and start_mask == 0b001
+
+    def test_rejects_backreferences(self):
+        """Verify that programs with backreferences are refused."""
+        tokens, _, _ = parse_pattern("(a)\\1")
+        with pytest.raises(ValueError):
+            build_nfa(compile_tokens(tokens))
+
+
+class TestLazyDfa:
+    """Tests on-demand construction of DFA states and transitions."""
+
+    def _build(self, pattern, max_states=1024):
+        tokens, has_start_anchor, _ = parse_pattern(pattern)
+        nfa = build_nfa(compile_tokens(tokens))
+        masks = build_nfa_masks(nfa[0], nfa[1])
+        return LazyDfa(
+            nfa, masks, has_start_anchor, character_matches_token, max_states
+        )
+
+    def test_builds_and_caches_transitions(self):
+        """Check that transitions are cached and flag accepting characters."""
+        dfa = self._build("ab")
+        entry = dfa.transition(dfa.start, ord("a"))
+        assert dfa.rows[dfa.start][ord("a")] == entry
+        assert not entry & 1
+        assert dfa.transition(entry >> 1, ord("b")) & 1
+        assert dfa.transition(dfa.start, ord("x")) == dfa.dead << 1
+        assert dfa.transition_char(dfa.start, "ğ") == dfa.dead << 1
+        assert dfa.wide_rows[dfa.start]["ğ"] == dfa.dead << 1
+
+    def test_refuses_states_beyond_limit(self):
+        """Verify that a full DFA reports -1 instead of adding states."""
+        dfa = self._build("ab", max_states=2)
+        assert dfa.transition(dfa.start, ord("a")) == -1
+        assert dfa.rows[dfa.start][ord("a")] == -1
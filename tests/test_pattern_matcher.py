@@ -1,11 +1,26 @@
+from dataclasses import replace
 from src.pattern_matcher import (
     match_pattern,
     character_matches_token,
-    calculate_min_match_length,
     calculate_start_indices,
     count_greedy_matches,
+    compile_pattern,
+    match_compiled,
+    compile_patterns,
+    compile_pattern_set,
+    match_any,
+    simulate_nfa,
+    scan_dfa,
+    try_match,
 )
 from src.pattern_parser import parse_pattern
+from src.pattern_compiler import (
+    LazyDfa,
+    calculate_min_match_length,
+    calculate_literal_prefix,
+    calculate_required_literal,
+    build_start_search,
+)
 
 
 class TestMatchPattern:
@@ -50,11 +65,118 @@ class TestMatchPattern:
         assert match_pattern("ab", "a?b") is True
         assert match_pattern("aaab", "a?b") is True
 
+    def test_repeated_groups(self):
+        """Check that + on a group repeats the whole group."""
+        assert match_pattern("abab", "^(ab)+$") is True
+        assert match_pattern("xaay", "^x(a|b)+y$") is True
+        assert match_pattern("abac", "^(ab)+$") is False
+
+    def test_backtracks_into_groups(self):
+        """Verify earlier alternatives are revisited when later tokens fail."""
+        assert match_pattern("abcd", "^(a|ab)(c|bcd)$") is True
+        assert match_pattern("aaab", "^(a+)ab$") is True
+
+    def test_nested_quantifiers_do_not_backtrack_exponentially(self):
+        """Check that memoized states keep catastrophic patterns tractable."""
+        assert match_pattern("a" * 200, "(a|a)+b") is False
+        assert match_pattern("a" * 200, "(a+)+b") is False
+        assert match_pattern("a" * 200, "(a|aa)+\\1b") is False
+        assert match_pattern("a" * 30 + "b", "(a|aa)+\\1b") is True
+
+    def test_plus_before_end_anchor(self):
+        """Check greedy tokens anchored to the end of the line."""
+        assert match_pattern("xx word9", "\\w+$")
+        assert match_pattern("aab", "a+b+$")
+        assert not match_pattern("word!", "\\w+$")
+
+    def test_plus_followed_by_literal_suffix(self):
+        """Check greedy runs that must stop before a literal suffix."""
+        assert match_pattern("aaab", "a+ab")
+        assert match_pattern("x foo bar foo baz", "^.+foo b")
+        assert not match_pattern("xxxfo", "x+foo")
+
+    def test_characters_beyond_table_range(self):
+        """Check single-character instructions on code points above 255."""
+        assert match_pattern("naïve ğ", "ğ$")
+        assert match_pattern("ā€", "^[^a]€?$")
+        assert not match_pattern("ā", "\\d")
+
+    def test_runs_of_optional_tokens(self):
+        """Check bounded matching of repeated optional tokens."""
+        assert match_pattern("xaab", "^xa?a?a?b$")
+        assert match_pattern("aaa", "^a?a?a?a$")
+        assert not match_pattern("aaaab", "^a?a?a?b")
+
+    def test_character_class_ranges(self):
+        """Check that ranges in classes match every character between their ends."""
+        assert match_pattern("id: x7", "[a-z][0-9]")
+        assert not match_pattern("A-7", "^[a-z]-")
+        assert match_pattern("a-b", "[a-]-b")
+        assert match_pattern("Привет", "^[А-Я][а-я]+$")
+        assert not match_pattern("abc", "[^a-c]")
+        assert character_matches_token("k", {"type": "char_class", "value": "[a-z]"})
+
+    def test_fixed_length_patterns(self):
+        """Check patterns made only of single characters, with anchors."""
+        assert match_pattern("call 555-0134 now", "\\d\\d\\d-\\d")
+        assert match_pattern("ends with 42", "\\d\\d$")
+        assert not match_pattern("42 first", "\\d\\d$")
+        assert match_pattern("ab", "^ab$")
+        assert not match_pattern("abc", "^ab$")
+        assert match_pattern("x", "")
+
     def test_backreference(self):
         """Verify backreference handling with group capture and \\1."""
         assert match_pattern("abab", "(ab)\\1") is True
         assert match_pattern("aba", "(ab)\\1") is False
 
+    def test_match_any_compiled_patterns(self):
+        """Check matching a line against several precompiled patterns."""
+        compiled = compile_patterns(["^cat", "\\d+"])
+        assert match_any("cat food", compiled)
+        assert match_any("tin 42", compiled)
+        assert not match_any("dog", compiled)
+        assert not match_any("anything", [])
+        assert len(compile_patterns(["x", "y", "x"])) == 2
+        assert len(compile_patterns(["X", "X"], ignore_case=True)) == 1
+
+        folded = compile_patterns(["HELLO", "World$"], ignore_case=True)
+        assert match_any("say hello", folded, ignore_case=True)
+        assert match_any("Big WORLD", folded, ignore_case=True)
+        assert not match_any("worlds", folded, ignore_case=True)
+
+    def test_ignore_case_folds_class_members(self):
+        """Check that -i folds class members instead of the pattern text."""
+        assert match_pattern("_", "[Z-a]", ignore_case=True)
+        assert match_pattern("Q", "[Z-a]", ignore_case=False) is False
+        assert match_pattern("z", "[Z-a]", ignore_case=True)
+        assert match_pattern("_", "[A-z]", ignore_case=True)
+        assert match_pattern("x_Y", "x[A-z]y", ignore_case=True)
+        assert match_pattern("a", "[^A]", ignore_case=True) is False
+        assert match_pattern("W", "\\W", ignore_case=True)
+        assert match_pattern("_", "\\W", ignore_case=True) is False
+        folded = compile_patterns(["[Z-a]x", "[A-z]+y"], ignore_case=True)
+        assert match_any("_X", folded, ignore_case=True)
+        assert match_any("^^Y", folded, ignore_case=True)
+
+    def test_patterns_without_prefix_are_combined(self):
+        """Verify unanchored patterns without a literal prefix share one pattern."""
+        compiled = compile_patterns(["\\d+x", "[ab]+c", "cat", "^dog"])
+        assert len(compiled) == 3
+        assert compiled[-1] is compile_pattern_set(("\\d+x", "[ab]+c"), False)
+        assert match_any("12x", compiled)
+        assert match_any("zabc", compiled)
+        assert match_any("a cat", compiled)
+        assert not match_any("12 abd hot dog", compiled)
+
+    def test_pattern_set_keeps_each_pattern_meaning(self):
+        """Check that combined patterns match exactly what they match alone."""
+        patterns = ("a)", "\\d\\", "(b|c)+d", "[xy]")
+        combined = compile_pattern_set(patterns)
+        for line in ["a)", "a", "1\\", "1", "cbd", "bc", "y", "z"]:
+            expected = any(match_pattern(line, pattern) for pattern in patterns)
+            assert match_compiled(line, combined) is expected
+
 
 class TestHelperFunctions:
     """Tests helper functions for token matching and pattern analysis."""
@@ -73,10 +195,25 @@ class TestHelperFunctions:
         assert character_matches_token("d", {"type": "char_class", "value": "[^abc]"})
         assert character_matches_token("x", {"type": "wildcard"})
 
+    def test_character_matches_token_beyond_table_range(self):
+        """Check characters outside the lookup tables use the fallback checks."""
+        tokens, _, _ = parse_pattern("\\w[^xyz][a€]")
+        assert character_matches_token("ж", tokens[0])
+        assert character_matches_token("€", tokens[1])
+        assert character_matches_token("€", tokens[2])
+        assert not character_matches_token("ж", tokens[2])
+
     def test_min_match_length(self):
         """Check minimum match length calculation for token sequences."""
         tokens, _, _ = parse_pattern("a(b|cd)?e+")
         assert calculate_min_match_length(tokens) == 2
+        group = {"type": "group", "alternatives": [tokens[:1], tokens]}
+        assert calculate_min_match_length([group]) == 1
+        tokens, _, _ = parse_pattern("(b?)\\1x")
+        assert calculate_min_match_length(tokens) == 1
+        assert tokens[0]["min_length"] == 0
+        assert match_pattern("x", "(b?)\\1$") is True
+        assert match_pattern("ca", "c(a|b?)\\1a$") is True
 
     def test_start_indices_with_and_without_anchor(self):
         """Test start index calculation with and without anchors."""
@@ -96,3 +233,117 @@ class TestHelperFunctions:
         token = tokens[0]
         assert count_greedy_matches("aaab", 0, token) == 3
         assert count_greedy_matches("baaa", 0, token) == 0
+
+    def test_count_greedy_matches_across_table_range(self):
+        """Check scanned runs continue past characters beyond the table."""
+        tokens = parse_pattern("\\w.[^x]")[0]
+        word, wildcard, negated = tokens[0], tokens[1], tokens[2]
+        assert count_greedy_matches("abéācd!", 0, word) == 6
+        assert count_greedy_matches("a€b\n", 0, wildcard) == 4
+        assert count_greedy_matches("aābx", 0, negated) == 3
+        digit = parse_pattern("\\d")[0][0]
+        assert count_greedy_matches("1²٣⁴x", 0, digit) == 4
+
+    def test_compile_pattern_is_cached(self):
+        """Check that compiling the same pattern twice reuses the result."""
+        compiled = compile_pattern("^a(b|c)+$")
+        assert compile_pattern("^a(b|c)+$") is compiled
+        assert compiled.has_start_anchor and compiled.has_end_anchor
+        assert compiled.min_length == 2
+        assert match_compiled("abcb", compiled)
+        assert not match_compiled("xabc", compiled)
+
+    def test_literal_prefix(self):
+        """Check literal prefix detection and prefix-driven matching."""
+        tokens, _, _ = parse_pattern("err?or")
+        assert calculate_literal_prefix(tokens) == "er"
+        tokens, _, _ = parse_pattern("\\d+x")
+        assert calculate_literal_prefix(tokens) == ""
+        assert match_pattern("an eror, then an error", "error$")
+        assert match_pattern("xxabab", "ab(ab)+")
+        assert not match_pattern("xxab", "^ab")
+
+    def test_required_literal(self):
+        """Check the longest literal every match must contain."""
+        tokens, _, _ = parse_pattern("\\d+ error: x+yz")
+        assert calculate_required_literal(tokens) == " error: x"
+        tokens, _, _ = parse_pattern("(a|b)cd?e")
+        assert calculate_required_literal(tokens) == "c"
+        tokens, _, _ = parse_pattern("\\w+")
+        assert calculate_required_literal(tokens) == ""
+        assert compile_pattern("ab+c").required == "ab"
+        assert match_pattern("x abbbc", "\\w+ ab+c")
+        assert not match_pattern("x abbb", "\\w+ ab+c")
+
+    def test_start_search(self):
+        """Check candidate start positions for patterns led by a class."""
+        tokens, _, _ = parse_pattern("\\d+x")
+        search = build_start_search(tokens)
+        assert search("ab12x", 0, 5).start() == 2
+        assert search("ab٣x", 0, 4).start() == 2
+        tokens, _, _ = parse_pattern("[xy]?z")
+        assert build_start_search(tokens)("abyz", 0, 4).start() == 2
+        tokens, _, _ = parse_pattern("(fox|cat) \\d")
+        assert build_start_search(tokens)("a dog, a cat 1", 0, 14).start() == 9
+        for pattern in ("a?b?", "(a|b?)", "(a?)\\1", "(\\1|a)b"):
+            tokens, _, _ = parse_pattern(pattern)
+            assert build_start_search(tokens) is None
+        assert match_pattern("abc 42x", "\\d+x")
+        assert match_pattern("one cat 9", "(dog|cat) \\d")
+        assert match_pattern("ayz", "(x|y)?z")
+        assert match_pattern("zzzbq", "[^z]q")
+
+    def test_simulate_nfa(self):
+        """Check the breadth-first NFA simulation against the backtracker."""
+        cases = [
+            ("abcabd", "(abc|abd)+$", True),
+            ("", "^a?$", True),
+            ("xxaay", "^a+y", False),
+            ("zz 123", "\\d\\d+$", True),
+            ("fox", "(f|g)o?x?y", False),
+            ("ça ğ", "[^a]\\w+$", True),
+        ]
+        for line, pattern, expected in cases:
+            compiled = compile_pattern(pattern)
+            assert simulate_nfa(line, compiled) is expected
+            assert match_compiled(line, compiled) is expected
+
+    def test_scan_dfa(self):
+        """Check DFA scanning, and the fallback once the DFA is full."""
+        cases = [
+            ("abcabd", "(abc|abd)+$", True),
+            ("", "^a?$", True),
+            ("xxaay", "^a+y", False),
+            ("x ğ 7", "ğ \\d$", True),
+        ]
+        for line, pattern, expected in cases:
+            assert scan_dfa(line, compile_pattern(pattern)) is expected
+
+        compiled = compile_pattern("(fox|cat) \\d+")
+        full = replace(
+            compiled,
+            dfa=LazyDfa(
+                compiled.nfa,
+                compiled.nfa_masks,
+                False,
+                character_matches_token,
+                max_states=2,
+            ),
+        )
+        assert scan_dfa("a cat 42", full) is None
+        assert match_compiled("a cat 42", full)
+
+    def test_long_lines_use_nfa(self):
+        """Verify long lines without backreferences still match correctly."""
+        line = "ab" * 50000 + "c"
+        assert match_pattern(line, "(ab)+c$")
+        assert not match_pattern(line, "(a|b)+d")
+
+    def test_failed_match_leaves_captures_untouched(self):
+        """Check that captures written on failed paths are rolled back."""
+        compiled = compile_pattern("(a)(b|c)\\2x")
+        captures = [None] * compiled.capture_slots
+        assert not try_match(compiled.columns, "abbcc", False, 0, 0, captures)
+        assert captures == [None, None, None]
+        assert try_match(compiled.columns, "abbx", False, 0, 0, captures)
+        assert captures == [None, "a", "b"]
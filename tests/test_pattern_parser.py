@@ -1,4 +1,5 @@
-from src.pattern_parser import parse_pattern
+import pytest
+from src.pattern_parser import find_referenced_groups, parse_class, parse_pattern
 
 
 class TestPatternParser:
@@ -33,9 +34,25 @@ class TestPatternParser:
         assert tokens[0]["value"] == "[abc]"
         assert tokens[1]["value"] == "[^xyz]"
 
+    def test_expands_character_class_ranges(self):
+        """Check that `a-z` inside a class is a range and edge dashes are literal."""
+        assert parse_class("[a-c_]") == ((("a", "c"), ("_", "_")), False)
+        assert parse_class("[^-x-]") == ((("-", "-"), ("x", "x"), ("-", "-")), True)
+        with pytest.raises(ValueError):
+            parse_class("[z-a]")
+
+        tokens, _, _ = parse_pattern("[a-f0-9][^а-я]")
+        assert tokens[0]["table"][ord("c")] == 1
+        assert tokens[0]["table"][ord("-")] == 0
+        assert tokens[0]["scanner"]("beef-", 0).end() == 4
+        assert tokens[1]["wide_test"]("ж") is False
+        assert tokens[1]["wide_test"]("ω") is True
+        tokens, _, _ = parse_pattern("([a-c]|-|x)")
+        assert tokens[0]["value"] == "[a-cx-]"
+
     def test_parses_groups_and_alternation_with_numbering(self):
         """Test parsing of groups, alternation, and group numbering."""
-        pattern = "(ab|cd)(e(f|g))"
+        pattern = "(ab|cd)(e(f|gh))"
         tokens, _, _ = parse_pattern(pattern)
         assert len(tokens) == 2
         assert tokens[0]["type"] == "group"
@@ -69,3 +86,68 @@ class TestPatternParser:
         assert tokens[0]["number"] == 1
         assert tokens[1]["type"] == "backreference"
         assert tokens[1]["number"] == 1
+
+    def test_attaches_lookup_tables(self):
+        """Check that escapes, classes and wildcards carry 256-entry tables."""
+        tokens, _, _ = parse_pattern("\\d[^ab].")
+        digit_table, class_table, wildcard_table = (t["table"] for t in tokens)
+        assert len(digit_table) == 256
+        assert digit_table[ord("7")] == 1 and digit_table[ord("x")] == 0
+        assert class_table[ord("a")] == 0 and class_table[ord("c")] == 1
+        assert all(wildcard_table)
+
+    def test_attaches_wide_tests(self):
+        """Check the tests used for characters beyond the lookup tables."""
+        tokens, _, _ = parse_pattern("ğ\\w[^ğ][şa].")
+        literal, word, negated, char_class, wildcard = (t["wide_test"] for t in tokens)
+        assert literal("ğ") and not literal("ş")
+        assert word("ş") and not word("—")
+        assert negated("ş") and not negated("ğ")
+        assert char_class("ş") and not char_class("ğ")
+        assert wildcard("—")
+
+    def test_scanners_cover_wide_characters(self):
+        """Check that scanners consume runs of characters beyond the tables."""
+        tokens, _, _ = parse_pattern("[aş]\\w[^x].")
+        assert [t["scanner"]("aşşa!", 0).end() for t in tokens] == [4, 4, 5, 5]
+        tokens, _, _ = parse_pattern("[]")
+        assert tokens[0]["scanner"] is None
+
+    def test_records_literal_suffix_after_plus(self):
+        """Check that `+` tokens remember the literal run that follows them."""
+        tokens, _, _ = parse_pattern(".+foo?")
+        assert tokens[0]["suffix"] == "fo"
+        tokens, _, _ = parse_pattern("a+\\db")
+        assert "suffix" not in tokens[0]
+
+    def test_records_group_min_length(self):
+        """Check that groups store the length of their shortest alternative."""
+        tokens, _, _ = parse_pattern("(ab|c(de|f)?)x")
+        assert tokens[0]["min_length"] == 1
+        assert tokens[0]["alternatives"][1][1]["min_length"] == 1
+
+    def test_merges_single_character_alternatives(self):
+        """Check that `(a|b|[cd])` becomes a class unless a backreference needs it."""
+        tokens, _, _ = parse_pattern("(a|\\.|[cd])+x")
+        assert tokens[0]["type"] == "char_class"
+        assert tokens[0]["value"] == "[a.cd]"
+        assert tokens[0]["quantifier"] == "+"
+        tokens, _, _ = parse_pattern("(a|b)(c|d)\\2")
+        assert [t["type"] for t in tokens] == ["char_class", "group", "backreference"]
+        assert tokens[1]["number"] == 2
+        tokens, _, _ = parse_pattern("(a|\\d)(\\^|b)")
+        assert tokens[0]["type"] == "group"
+        assert tokens[1]["value"] == "[b^]"
+
+    def test_marks_plus_before_disjoint_token_atomic(self):
+        """Check that `+` is atomic only when the next token shares no character."""
+        for pattern in ("\\d+x", "[ab]+c", "\\w+ ", "a+[^a]"):
+            tokens, _, _ = parse_pattern(pattern)
+            assert tokens[0].get("atomic") is True, pattern
+        for pattern in ("\\w+\\d", "a+b?a", ".+x", "\\w+[^a]", "a+(b)"):
+            tokens, _, _ = parse_pattern(pattern)
+            assert "atomic" not in tokens[0], pattern
+
+    def test_finds_referenced_groups(self):
+        """Verify backreference numbers are found and escaped backslashes skipped."""
+        assert find_referenced_groups("(a)(b)\\2\\\\1\\12") == {2, 12}